@@ -1,7 +1,29 @@
-from fastapi import Depends
-from sqlalchemy.orm import Session
+from typing import Any, Dict, Optional
+from fastapi import Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.security import get_current_user
+from crud.user import get_cached_user
 from database.session import get_db
+from schemas.user import UserResponse
 
-def get_db_session() -> Session:
+def get_db_session() -> AsyncSession:
     return Depends(get_db)
+
+def require_user(role: Optional[str] = None, detail: str = "Not authorized to access this resource") -> Any:
+    """Authenticate the request and resolve its user, optionally restricted to one role."""
+    async def dependency(payload: Dict[str, Any] = Depends(get_current_user), db: AsyncSession = Depends(get_db)) -> UserResponse:
+        try:
+            user_id = int(payload["sub"])
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(status_code=401, detail="Invalid token")
+
+        if role and payload.get("role") != role:
+            raise HTTPException(status_code=403, detail=detail)
+
+        user = await get_cached_user(db, user_id)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        return user
+
+    return Depends(dependency)
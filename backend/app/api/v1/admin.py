@@ -1,93 +1,95 @@
-from fastapi import APIRouter, HTTPException
-from sqlalchemy.orm import Session
-from typing import Dict, Any
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Any, List, Literal, Optional, cast
 
-from core.security import decode_token
-from crud.user import get_user, get_users, get_total_active_users, get_total_recruiters, get_total_users, get_total_candidates
+from crud.user import get_users, get_total_active_users, get_total_recruiters, get_total_users, get_total_candidates
 from crud.job import get_jobs, get_total_jobs
-from api.dependencies import get_db_session
+from crud.stats import get_site_stats
+from crud.export import EXPORT_COLUMNS, stream_export_rows
+from api.dependencies import get_db_session, require_user
 from schemas.user import UserResponse
 from schemas.job import JobResponse
+from schemas.pagination import Page
+from utils.model_registry import model_registry
+from utils.pagination import decode_cursor, page_response, paginated
+from utils.record_stream import aiter_csv_chunks, aiter_ndjson_chunks
 
 
 router = APIRouter()
 
 
-@router.get('/users')
-async def list_users(token: str, skip: int = 0, limit: int = 100, db: Session = get_db_session()) -> Dict[str, Any]:
-    """List users with pagination."""
-    payload = decode_token(token)
-    user_id = payload.get("sub")
-    if not user_id:
-        raise HTTPException(status_code=401, detail='Invalid token')
-    
-    user = get_user(db, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail='User not found')
-
-    user_role = payload.get("role")
-    if user_role != "admin":
-        raise HTTPException(status_code=403, detail='Not authorized to access this resource')
-
-    users = get_users(db, skip=skip, limit=limit)
-    total = get_total_users(db)
-
-    return {
-        "data": [UserResponse.model_validate(u) for u in users],
-        "total": total,
-        "skip": skip,
-        "limit": limit,
-        "page": (skip // limit) + 1,
-        "total_pages": (total + limit - 1) // limit,
-    }
-
-
-@router.get('/jobs')
-async def list_jobs(token: str, skip: int = 0, limit: int = 100, db: Session = get_db_session()) -> Dict[str, Any]:
-    """List jobs with pagination."""
-    payload = decode_token(token)
-    user_id = payload.get("sub")
-    if not user_id:
-        raise HTTPException(status_code=401, detail='Invalid token')
-    
-    user = get_user(db, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail='User not found')
-
-    user_role = payload.get("role")
-    if user_role != "admin":
-        raise HTTPException(status_code=403, detail='Not authorized to access this resource')
-
-    jobs = get_jobs(db, skip=skip, limit=limit)
-    total = get_total_jobs(db)
-
-    return {
-        "data": [JobResponse.model_validate(j) for j in jobs],
-        "total": total,
-        "skip": skip,
-        "limit": limit,
-        "page": (skip // limit) + 1,
-        "total_pages": (total + limit - 1) // limit,
-    }
+@router.get('/users', response_model=Page[UserResponse])
+async def list_users(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, include_total: bool = False, user: UserResponse = require_user("admin"), db: AsyncSession = get_db_session()) -> Response:
+    """List users with offset pagination, or keyset pagination when a cursor is given."""
+    after_id = decode_cursor(cursor) if cursor is not None else None
+    users = await get_users(db, skip=skip if cursor is None else 0, limit=limit, after_id=after_id)
+    total = await get_total_users(db) if cursor is None or include_total else None
+
+    return page_response(UserResponse, paginated(users, [cast(int, u.id) for u in users], skip, limit, cursor, total))
+
+
+@router.get('/jobs', response_model=Page[JobResponse])
+async def list_jobs(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, include_total: bool = False, user: UserResponse = require_user("admin"), db: AsyncSession = get_db_session()) -> Response:
+    """List jobs with offset pagination, or keyset pagination when a cursor is given."""
+    after_id = decode_cursor(cursor) if cursor is not None else None
+    jobs = await get_jobs(db, skip=skip if cursor is None else 0, limit=limit, after_id=after_id)
+    total = await get_total_jobs(db) if cursor is None or include_total else None
+
+    return page_response(JobResponse, paginated(jobs, [cast(int, j.id) for j in jobs], skip, limit, cursor, total))
+
+
+@router.get('/export/{entity}')
+async def export(entity: Literal["users", "jobs", "applications"], format: Literal["csv", "ndjson"] = "csv", user: UserResponse = require_user("admin"), db: AsyncSession = get_db_session()) -> StreamingResponse:
+    """
+    Stream a whole table as CSV or NDJSON in one response. Rows are read through a server-side
+    cursor in EXPORT_BATCH_SIZE batches and written as they arrive, so memory stays flat.
+    """
+    columns = [column.key for column in EXPORT_COLUMNS[entity]]
+    rows = stream_export_rows(db, entity)
+    if format == "csv":
+        body, media_type = aiter_csv_chunks(columns, rows), "text/csv"
+    else:
+        body, media_type = aiter_ndjson_chunks(columns, rows), "application/x-ndjson"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={entity}.{format}"},
+    )
 
 
 @router.get('/overview')
-async def overview(token: str, db: Session = get_db_session()) -> Dict[str, int]:
-    payload = decode_token(token)
-    user_id = payload.get("sub")
-    if not user_id:
-        raise HTTPException(status_code=401, detail='Invalid token')
-    
-    user = get_user(db, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail='User not found')
-
-    user_role = payload.get("role")
-    if user_role != "admin":
-        raise HTTPException(status_code=403, detail='Not authorized to access this resource')
-
-    return {"totalUsers": get_total_users(db),
-    "totalJobs": get_total_jobs(db),
-    "activeUsers": get_total_active_users(db),
-    "candidates": get_total_candidates(db),
-    "recruiters": get_total_recruiters(db),}
+async def overview(user: UserResponse = require_user("admin"), db: AsyncSession = get_db_session()) -> Dict[str, int]:
+    """Site-wide counters, read from the trigger-maintained site_stats row."""
+    stats = await get_site_stats(db)
+    if not stats:
+        return {"totalUsers": await get_total_users(db),
+        "totalJobs": await get_total_jobs(db),
+        "activeUsers": await get_total_active_users(db),
+        "candidates": await get_total_candidates(db),
+        "recruiters": await get_total_recruiters(db),}
+
+    return {"totalUsers": cast(int, stats.total_users),
+    "totalJobs": cast(int, stats.total_jobs),
+    "activeUsers": cast(int, stats.active_users),
+    "candidates": cast(int, stats.candidates),
+    "recruiters": cast(int, stats.recruiters),}
+
+
+@router.get('/models')
+async def list_models(user: UserResponse = require_user("admin"), db: AsyncSession = get_db_session()) -> Dict[str, Any]:
+    """List registered resume classifier versions and the active one."""
+    versions: List[Dict[str, Any]] = model_registry.list_versions()
+    return {"active": model_registry.current().version, "versions": versions}
+
+
+@router.post('/models/activate')
+async def activate_model(version: str, user: UserResponse = require_user("admin"), db: AsyncSession = get_db_session()) -> Dict[str, str]:
+    """Hot-swap the resume classifier to a registered version."""
+    try:
+        model = model_registry.activate(version)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    return {"active": model.version}
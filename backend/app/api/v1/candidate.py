@@ -1,22 +1,29 @@
-from fastapi import APIRouter, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, HTTPException, Request, Response, status, UploadFile, File
 from fastapi.responses import FileResponse
-from datetime import datetime, timezone
-from typing import Dict, Any, cast
-from os import makedirs, path, remove
+from typing import Dict, Any, List, Optional, cast
+from os import makedirs, path, remove, replace
+from uuid import uuid4
+import hashlib
 import aiofiles
-from sqlalchemy.orm import Session
-
-from core.security import decode_token
-from crud.user import create_user, get_user, get_user_by_email
-from crud.resume import create_resume
-from crud.job import get_job, candidate_jobs, get_total_candidate_jobs
-from crud.application import apply_for_job, delete_applications_by_id, get_applications_by_candidate, get_total_applications_by_candidate
-from api.dependencies import get_db_session
-from schemas.user import UserCreate
-from schemas.job import JobResponse
-from schemas.application import ApplicationResponse
-from models.resume import Resume
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from crud.user import create_user, get_user_by_email
+from crud.resume import create_resume, count_resumes_by_storage_path, get_resume_by_hash, get_resume_by_user
+from crud.job import get_job, get_jobs_by_ids, candidate_jobs, get_total_candidate_jobs, search_jobs
+from crud.application import apply_for_job, apply_for_jobs, delete_applications_by_id, get_application, get_applied_job_ids, get_applications_by_candidate, get_total_applications_by_candidate
+from api.dependencies import get_db_session, require_user
+from schemas.user import UserCreate, UserResponse
+from schemas.job import JobResponse, RecommendedJobResponse
+from schemas.application import ApplicationResponse, ApplyJobResult, BulkApplyRequest
+from schemas.pagination import Page
 from models.application import Application
+from utils.scoring_executor import compute_description_scores, compute_resume_outputs, ensure_resume_outputs, run_scoring
+from utils.simmilarity_score import job_title_prob
+from utils.model_registry import model_registry
+from utils.job_index import job_title_index
+from utils.talent_index import talent_index
+from utils.http_cache import cached_file_response
+from utils.pagination import decode_cursor, page_response, paginated
 
 
 router = APIRouter()
@@ -25,62 +32,95 @@ UPLOAD_DIR = "../uploads/resumes"
 makedirs(UPLOAD_DIR, exist_ok=True)
 
 
+async def remove_unreferenced_resume_file(db: AsyncSession, storage_path: str) -> None:
+    """
+    Delete a stored resume file once no resume row points to it any more. The file is moved aside
+    before a second count and put back if an upload of the same content committed in between;
+    an upload committing later moves its own copy into place.
+    """
+    if await count_resumes_by_storage_path(db, storage_path) != 0 or not path.exists(storage_path):
+        return
+
+    trash_path = f"{storage_path}.{uuid4().hex}.deleted"
+    try:
+        replace(storage_path, trash_path)
+    except FileNotFoundError:
+        return
+    if await count_resumes_by_storage_path(db, storage_path) == 0:
+        remove(trash_path)
+    else:
+        replace(trash_path, storage_path)
+
+
 @router.post("/signup", status_code=status.HTTP_201_CREATED)
-async def signup(user: UserCreate, db: Session = get_db_session()) -> None :
+async def signup(user: UserCreate, db: AsyncSession = get_db_session()) -> None :
     """Register a new candidate user."""
-    existing = get_user_by_email(db, user.email)
+    existing = await get_user_by_email(db, user.email)
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    create_user(db, user, role="candidate")
+    await create_user(db, user, role="candidate")
 
 
 @router.post("/upload_resume", status_code=status.HTTP_201_CREATED)
-async def upload_resume(token: str, file: UploadFile = File(...), db: Session = get_db_session()) -> FileResponse:
+async def upload_resume(file: UploadFile = File(...), user: UserResponse = require_user("candidate", "Access denied: only candidates can upload there resumes"), db: AsyncSession = get_db_session()) -> FileResponse:
     """Upload or replace a candidate's resume and return the uploaded file."""
-    payload = decode_token(token)
-    user_id = payload.get("sub")
-    role = payload.get("role")
-
-    if not user_id or not role:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
-    if role != "candidate":
-        raise HTTPException(status_code=403, detail="Access denied: only candidates can upload there resumes")
-
-    user = get_user(db, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
     if not file or not file.filename:
         raise HTTPException(status_code=400, detail="File not provided")
 
     if not file.filename.lower().endswith((".pdf")):
         raise HTTPException(status_code=400, detail="Invalid file type. Only PDF allowed.")
 
-    old_resume = db.query(Resume).filter(Resume.user_id == user_id).first()
-    if old_resume:
-        try:
-            if path.exists(str(old_resume.storage_path)):
-                remove(str(old_resume.storage_path))
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Error deleting old resume: {e}")
-        db.delete(old_resume)
-        db.commit()
-
-    filename = f"{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}_{file.filename}"
-    storage_path = path.join(UPLOAD_DIR, filename)
-
-    async with aiofiles.open(storage_path, "wb") as buffer:
+    # Store the file under the SHA-256 of its content, hashing while it streams to disk.
+    digest = hashlib.sha256()
+    tmp_path = path.join(UPLOAD_DIR, f".{uuid4().hex}.part")
+    async with aiofiles.open(tmp_path, "wb") as buffer:
         while chunk := await file.read(1024 * 1024):
+            digest.update(chunk)
             await buffer.write(chunk)
 
-    create_resume(
-        db=db,
-        user_id=user_id,
-        filename=file.filename,
-        storage_path=storage_path,
-    )
+    content_hash = digest.hexdigest()
+    storage_path = path.join(UPLOAD_DIR, f"{content_hash}.pdf")
+
+    try:
+        # Identical content uploaded before: reuse its extracted text and model outputs.
+        known = await get_resume_by_hash(db, content_hash)
+        if known and known.class_probs is not None and known.model_version == model_registry.current().version:
+            text_content = cast(str, known.text_content)
+            class_probs = cast(bytes, known.class_probs)
+            model_version = cast(str, known.model_version)
+        else:
+            text_content, class_probs, model_version = await run_scoring(
+                compute_resume_outputs, known.text_content if known else None, tmp_path
+            )
+
+        old_resume = await get_resume_by_user(db, user.id)
+        old_storage_path = str(old_resume.storage_path) if old_resume else None
+        resume = await create_resume(
+            db=db,
+            user_id=user.id,
+            filename=file.filename,
+            storage_path=storage_path,
+            text_content=text_content,
+            class_probs=class_probs,
+            model_version=model_version,
+            content_hash=content_hash,
+            replacing=old_resume,
+        )
+        # Move the file into place only once its row is committed, even over an identical copy:
+        # another user's delete may have removed that copy while it counted no rows.
+        replace(tmp_path, storage_path)
+    finally:
+        if path.exists(tmp_path):
+            remove(tmp_path)
+    talent_index.add(resume)
+
+    # The old file goes only once the new resume is committed in its place.
+    if old_storage_path is not None and old_storage_path != storage_path:
+        try:
+            await remove_unreferenced_resume_file(db, old_storage_path)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error deleting old resume: {e}")
 
     return FileResponse(
         path=storage_path,
@@ -90,170 +130,166 @@ async def upload_resume(token: str, file: UploadFile = File(...), db: Session =
 
 
 @router.get("/my_resume")
-async def my_resume(token: str, db: Session = get_db_session()) -> FileResponse:
-    """Return the candidate's uploaded resume file."""
-    payload = decode_token(token)
-    user_id = payload.get("sub")
-    role = payload.get("role")
-
-    if not user_id or not role:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
-    if role != "candidate":
-        raise HTTPException(status_code=403, detail="Access denied: only candidates can view there resumes")
-
-    user = get_user(db, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    resume = db.query(Resume).filter(Resume.user_id == user_id).first()
+async def my_resume(request: Request, user: UserResponse = require_user("candidate", "Access denied: only candidates can view there resumes"), db: AsyncSession = get_db_session()) -> Response:
+    """Return the candidate's uploaded resume file, or 304 when the client's cached copy is current."""
+    resume = await get_resume_by_user(db, user.id)
     if not resume:
         raise HTTPException(status_code=404, detail="No resume found for this user")
 
     if not path.exists(str(resume.storage_path)):
         raise HTTPException(status_code=404, detail="Resume file missing on server")
 
-    return FileResponse(
-        path=str(resume.storage_path),
-        filename=str(resume.filename),
-        media_type="application/octet-stream",
-        headers={"Content-Disposition": f"attachment; filename={resume.filename}"}
+    return cached_file_response(
+        request,
+        str(resume.storage_path),
+        str(resume.filename),
+        content_hash=cast(Optional[str], resume.content_hash),
     )
 
 
 @router.delete("/delete_my_resume", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_my_resume(token: str, db: Session = get_db_session()) -> None:
+async def delete_my_resume(user: UserResponse = require_user("candidate", "Access denied: only candidates can delete there resumes"), db: AsyncSession = get_db_session()) -> None:
     """Delete the candidate's uploaded resume (file + database record)."""
-    payload = decode_token(token)
-    user_id = payload.get("sub")
-    role = payload.get("role")
-
-    if not user_id or not role:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
-    if role != "candidate":
-        raise HTTPException(status_code=403, detail="Access denied: only candidates can delete there resumes")
-
-    user = get_user(db, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    resume = db.query(Resume).filter(Resume.user_id == user_id).first()
+    resume = await get_resume_by_user(db, user.id)
     if not resume:
         raise HTTPException(status_code=404, detail="No resume found for this user")
 
+    storage_path = str(resume.storage_path)
+    await db.delete(resume)
+    await db.commit()
+    talent_index.remove_user(user.id)
+
     try:
-        if path.exists(str(resume.storage_path)):
-            remove(str(resume.storage_path))
+        await remove_unreferenced_resume_file(db, storage_path)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deleting file: {e}")
 
-    db.delete(resume)
-    db.commit()
 
+@router.get('/jobs', response_model=Page[JobResponse])
+async def list_jobs(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, include_total: bool = False, user: UserResponse = require_user("candidate", "Access denied: only candidates can see jobs."), db: AsyncSession = get_db_session()) -> Response:
+    """List jobs with offset pagination, or keyset pagination when a cursor is given."""
+    after_id = decode_cursor(cursor) if cursor is not None else None
+    jobs = await candidate_jobs(db, user.id, skip if cursor is None else 0, limit, after_id)
+    total = await get_total_candidate_jobs(db, user.id) if cursor is None or include_total else None
 
-@router.get('/jobs')
-async def list_jobs(token: str, skip: int = 0, limit: int = 100, db: Session = get_db_session()) -> Dict[str, Any]:
-    """List jobs with pagination."""
-    payload = decode_token(token)
-    user_id = payload.get("sub")
-    if not user_id:
-        raise HTTPException(status_code=401, detail='Invalid token')
-    
-    user = get_user(db, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail='User not found')
+    return page_response(JobResponse, paginated(jobs, [cast(int, j.id) for j in jobs], skip, limit, cursor, total))
 
-    user_role = payload.get("role")
-    if user_role != "candidate":
-        raise HTTPException(status_code=403, detail="Access denied: only candidates can see jobs.")
 
-    jobs = candidate_jobs(db, user_id, skip, limit)
-    total = get_total_candidate_jobs(db, user_id)
+@router.get('/jobs/search', response_model=Page[JobResponse])
+async def search(q: str, skip: int = 0, limit: int = 20, user: UserResponse = require_user("candidate", "Access denied: only candidates can search jobs."), db: AsyncSession = get_db_session()) -> Response:
+    """Search open jobs by keyword, most relevant first."""
+    jobs = await search_jobs(db, q, skip, limit)
 
-    return {
-        "data": [JobResponse.model_validate(j) for j in jobs],
-        "total": total,
+    return page_response(JobResponse, {
+        "data": jobs,
         "skip": skip,
         "limit": limit,
-        "page": (skip // limit) + 1,
-        "total_pages": (total + limit - 1) // limit,
+    })
+
+
+@router.get('/recommended_jobs')
+async def recommended_jobs(limit: int = 10, user: UserResponse = require_user("candidate", "Access denied: only candidates can see recommended jobs."), db: AsyncSession = get_db_session()) -> Dict[str, Any]:
+    """List the open jobs that best match the candidate's resume, best first."""
+    resume = await get_resume_by_user(db, user.id)
+    if not resume:
+        raise HTTPException(status_code=404, detail="No resume found for this user")
+
+    probs = await ensure_resume_outputs(resume)
+    model = model_registry.current()
+    await db.commit()
+
+    applied_job_ids = await get_applied_job_ids(db, user.id)
+    ranked = await db.run_sync(job_title_index.top_k, probs, model.class_index, limit, applied_job_ids)
+    scores = dict(ranked)
+    jobs = await get_jobs_by_ids(db, [job_id for job_id, _ in ranked])
+
+    return {
+        "data": [
+            RecommendedJobResponse(**JobResponse.model_validate(j).model_dump(), match_score=scores[cast(int, j.id)])
+            for j in jobs
+        ],
+        "limit": limit,
     }
 
 
 @router.post("/apply_job", response_model=ApplicationResponse)
-async def apply_job(token: str, job_id: int, db: Session = get_db_session()) -> Application:
-    payload = decode_token(token)
-    user_id = payload.get("sub")
-    if not user_id:
-        raise HTTPException(status_code=401, detail='Invalid token')
-    
-    user = get_user(db, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail='User not found')
-
-    user_role = payload.get("role")
-    if user_role != "candidate":
-        raise HTTPException(status_code=403, detail="Access denied: only candidates can apply for job.")
-    
-    resume = db.query(Resume).filter(Resume.user_id == user_id).first()
+async def apply_job(job_id: int, user: UserResponse = require_user("candidate", "Access denied: only candidates can apply for job."), db: AsyncSession = get_db_session()) -> Application:
+    resume = await get_resume_by_user(db, user.id)
     if not resume:
         raise HTTPException(status_code=404, detail="No resume found for this user")
     
-    job = get_job(db, job_id)
+    job = await get_job(db, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    return apply_for_job(db, user_id, job_id, cast(int, resume.id))
+    probs = await ensure_resume_outputs(resume)
+    model = model_registry.current()
+    description_scores = await run_scoring(compute_description_scores, str(resume.text_content or ""), [job_id])
 
+    return await apply_for_job(
+        db, user.id, job_id, cast(int, resume.id),
+        job_title_prob(probs, str(job.title), model), model.version,
+        description_score=description_scores.get(job_id),
+    )
 
-@router.delete("/delete_application", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_application(token: str, app_id: int, db: Session = get_db_session()) -> None:
-    payload = decode_token(token)
-    user_id = payload.get("sub")
-    if not user_id:
-        raise HTTPException(status_code=401, detail='Invalid token')
-    
-    user = get_user(db, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail='User not found')
 
-    user_role = payload.get("role")
-    if user_role != "candidate":
-        raise HTTPException(status_code=403, detail="Access denied: only candidates can delete application.")
-    
-    application = db.query(Application).filter(Application.id == app_id).first()
+@router.post("/apply_jobs", response_model=List[ApplyJobResult])
+async def apply_jobs(request: BulkApplyRequest, user: UserResponse = require_user("candidate", "Access denied: only candidates can apply for job."), db: AsyncSession = get_db_session()) -> List[Dict[str, Any]]:
+    """
+    Apply to many jobs at once. The resume is parsed and classified once, each job is scored by its
+    title's class probability, and all applications are inserted in one transaction.
+    Returns one result per requested job with status applied, already_applied or not_found.
+    """
+    resume = await get_resume_by_user(db, user.id)
+    if not resume:
+        raise HTTPException(status_code=404, detail="No resume found for this user")
+
+    job_ids = list(dict.fromkeys(request.job_ids))
+    jobs = {cast(int, j.id): j for j in await get_jobs_by_ids(db, job_ids)}
+    applied_job_ids = set(await get_applied_job_ids(db, user.id))
+    new_job_ids = [job_id for job_id in job_ids if job_id in jobs and job_id not in applied_job_ids]
+
+    probs = await ensure_resume_outputs(resume)
+    model = model_registry.current()
+    description_scores = await run_scoring(compute_description_scores, str(resume.text_content or ""), new_job_ids) if new_job_ids else {}
+
+    applications = await apply_for_jobs(db, user.id, cast(int, resume.id), model.version, [
+        (job_id, job_title_prob(probs, str(jobs[job_id].title), model), description_scores.get(job_id))
+        for job_id in new_job_ids
+    ])
+    by_job = {cast(int, a.job_id): a for a in applications}
+
+    results: List[Dict[str, Any]] = []
+    for job_id in job_ids:
+        if job_id in by_job:
+            results.append({"job_id": job_id, "status": "applied", "application": by_job[job_id]})
+        elif job_id in jobs:
+            results.append({"job_id": job_id, "status": "already_applied"})
+        else:
+            results.append({"job_id": job_id, "status": "not_found"})
+    return results
+
+
+@router.delete("/delete_application", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_application(app_id: int, user: UserResponse = require_user("candidate", "Access denied: only candidates can delete application."), db: AsyncSession = get_db_session()) -> None:
+    application = await get_application(db, app_id)
     if not application:
         raise HTTPException(status_code=404, detail='Application not found.')
     
-    delete_applications_by_id(db, app_id)
+    await delete_applications_by_id(db, app_id)
 
-@router.get("/my_applications")
-async def my_applications(token: str, skip: int = 0, limit: int = 100, db: Session = get_db_session()) -> Dict[str, Any]:
+@router.get("/my_applications", response_model=Page[ApplicationResponse])
+async def my_applications(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, include_total: bool = False, user: UserResponse = require_user("candidate", "Access denied: only candidates can view their applications"), db: AsyncSession = get_db_session()) -> Response:
     """
     Get all applications submitted by the currently logged-in candidate.
+    Pass cursor (empty for the first page, then next_cursor) for keyset pagination instead of skip.
     """
-    payload = decode_token(token)
-    user_id = payload.get("sub")
-    if not user_id:
-        raise HTTPException(status_code=401, detail="Invalid token")
-    
-    user = get_user(db, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    user_role = payload.get("role")
-    if user_role != "candidate":
-        raise HTTPException(status_code=403, detail="Access denied: only candidates can view their applications")
-    
-    applications = get_applications_by_candidate(db, user_id, skip, limit)
-    total = get_total_applications_by_candidate(db, user_id)
-
-    return {
-        "data": [ApplicationResponse.model_validate(a) for a in applications],
-        "total": total,
-        "skip": skip,
-        "limit": limit,
-        "page": (skip // limit) + 1,
-        "total_pages": (total + limit - 1) // limit,
-    }
+    after_id = decode_cursor(cursor) if cursor is not None else None
+    applications = await get_applications_by_candidate(db, user.id, skip if cursor is None else 0, limit, after_id)
+    total = await get_total_applications_by_candidate(db, user.id) if cursor is None or include_total else None
+
+    return page_response(ApplicationResponse, paginated(
+        applications,
+        [cast(int, a.id) for a in applications],
+        skip, limit, cursor, total,
+    ))
@@ -1,155 +1,217 @@
-from fastapi import APIRouter, HTTPException, status
-import base64
-from sqlalchemy.orm import Session
-from typing import List, Dict, Any, cast
-
-from core.security import decode_token, settings
-from crud.user import create_user, get_user_by_email, get_user
-from crud.job import create_job, delete_job, get_job, recruiter_jobs, get_total_recruiter_jobs
-from crud.application import get_applications_by_job, get_total_applications_by_job
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from os import path
+import json
+from pydantic import ValidationError
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, Callable, List, Dict, Any, Optional, Tuple, cast
+
+from core.security import settings
+from crud.user import create_user, get_user_by_email, get_users_by_ids
+from crud.job import create_job, create_jobs, delete_job, get_job, recruiter_jobs, get_total_recruiter_jobs
+from crud.application import get_application_resume, get_application_rows_by_job, get_total_applications_by_job
 from crud.application import update_application_status as crud_update_application_status
-from crud.resume import get_resume_by_user
-from api.dependencies import get_db_session
-from schemas.user import UserCreate
+from crud.resume import get_resumes_by_ids
+from api.dependencies import get_db_session, require_user
+from schemas.user import UserCreate, UserResponse
 from schemas.job import JobCreate, JobResponse
+from schemas.application import JobApplicationResponse
+from schemas.pagination import Page
+from utils.job_index import job_title_index
+from utils.talent_index import talent_index
+from utils.model_registry import model_registry
+from utils.description_index import index_jobs, unindex_job
+from utils.zip_stream import stream_zip
+from utils.http_cache import cached_file_response
+from utils.pagination import decode_cursor, page_response, paginated
+from utils.record_stream import Record, aiter_csv_records, aiter_lines, aiter_ndjson_records
 
 
 router = APIRouter()
 
+IMPORT_PARSERS: Dict[str, Callable[[AsyncIterator[str]], AsyncIterator[Record]]] = {
+    "text/csv": aiter_csv_records,
+    "application/x-ndjson": aiter_ndjson_records,
+    "application/ndjson": aiter_ndjson_records,
+}
+
 
 @router.post("/signup", status_code=status.HTTP_201_CREATED)
-async def signup(user: UserCreate, db: Session = get_db_session()) -> None :
+async def signup(user: UserCreate, db: AsyncSession = get_db_session()) -> None :
     """Register a new recruiter user."""
-    existing = get_user_by_email(db, user.email)
+    existing = await get_user_by_email(db, user.email)
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    create_user(db, user, role="recruiter")
+    await create_user(db, user, role="recruiter")
 
 
 @router.get("/job_titles")
-async def job_titles(token: str, db: Session = get_db_session()) -> List[str]:
-    payload = decode_token(token)
-    user_id = payload.get("sub")
-    role = payload.get("role")
-
-    if not user_id or not role:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
-    if role != "recruiter":
-        raise HTTPException(status_code=403, detail="Access denied: only recruiter can create jobs")
-
-    user = get_user(db, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
+async def job_titles(user: UserResponse = require_user("recruiter", "Access denied: only recruiter can create jobs"), db: AsyncSession = get_db_session()) -> List[str]:
     return settings.JOBS
 
 
 @router.post("/add_job", status_code=status.HTTP_201_CREATED)
-async def add_job(token: str, job: JobCreate, db: Session = get_db_session()) -> None:
-    payload = decode_token(token)
-    user_id = payload.get("sub")
-    role = payload.get("role")
-
-    if not user_id or not role:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
-    if role != "recruiter":
-        raise HTTPException(status_code=403, detail="Access denied: only recruiter can create jobs")
-
-    user = get_user(db, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
+async def add_job(job: JobCreate, user: UserResponse = require_user("recruiter", "Access denied: only recruiter can create jobs"), db: AsyncSession = get_db_session()) -> None:
     if job.title_id >= len(settings.JOBS):
         raise HTTPException(status_code=400, detail="Invalid tittle id")
     
-    create_job(db, user_id, job)
-
-
-@router.get("/my_jobs")
-async def my_jobs(token: str, skip: int = 0, limit: int = 100, db: Session = get_db_session()) -> Dict[str, Any]:
-    payload = decode_token(token)
-    user_id = payload.get("sub")
-    role = payload.get("role")
-
-    if not user_id or not role:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
-    if role != "recruiter":
-        raise HTTPException(status_code=403, detail="Access denied: only recruiter can see there jobs")
-
-    user = get_user(db, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    jobs = recruiter_jobs(db, user_id)
-    total = get_total_recruiter_jobs(db, user_id)
+    db_job = await create_job(db, user.id, job)
+    job_title_index.invalidate()
+    await index_jobs([(cast(int, db_job.id), cast(Optional[str], db_job.description))])
+
+
+async def _import_batch(db: AsyncSession, recruiter_id: int, batch: List[Tuple[int, JobCreate]]) -> Tuple[List[Tuple[int, Optional[str]]], List[Tuple[int, str]]]:
+    """
+    Insert one batch of (line, job) rows. If the database rejects the batch, insert its rows one by one
+    so only the offending rows fail. Returns the (id, description) pairs of the created jobs for the
+    description index, and the (line, error) of each rejected row.
+    """
+    try:
+        jobs = await create_jobs(db, recruiter_id, [job for _, job in batch])
+    except DBAPIError:
+        await db.rollback()
+        jobs, rejected = [], []
+        for line, job in batch:
+            try:
+                jobs += await create_jobs(db, recruiter_id, [job])
+            except DBAPIError:
+                await db.rollback()
+                rejected.append((line, "Rejected by the database"))
+    else:
+        rejected = []
+    return [(cast(int, job.id), cast(Optional[str], job.description)) for job in jobs], rejected
+
+
+@router.post("/import_jobs")
+async def import_jobs(request: Request, user: UserResponse = require_user("recruiter", "Access denied: only recruiter can create jobs"), db: AsyncSession = get_db_session()) -> Dict[str, Any]:
+    """
+    Create jobs from a CSV body (text/csv, with a header row) or NDJSON body (application/x-ndjson)
+    carrying the fields of JobCreate. The body is parsed as it streams in, and valid rows are inserted
+    and committed in batches of JOB_IMPORT_BATCH_SIZE. Invalid rows, and rows the database rejects, are
+    skipped and reported by line number (the first JOB_IMPORT_MAX_ERRORS of them) without stopping the
+    import. Committed jobs are added to the description index, off the event loop, every
+    JOB_IMPORT_INDEX_BATCH_SIZE jobs and when the import ends, even if it ends with an error.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    parse = IMPORT_PARSERS.get(content_type)
+    if parse is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Send the jobs as {' or '.join(IMPORT_PARSERS)}",
+        )
 
-    return {
-        "data": [JobResponse.model_validate(j) for j in jobs],
+    imported = failed = 0
+    errors: List[Dict[str, Any]] = []
+    batch: List[Tuple[int, JobCreate]] = []
+    unindexed: List[Tuple[int, Optional[str]]] = []
+
+    def report(line: int, error: str) -> None:
+        nonlocal failed
+        failed += 1
+        if len(errors) < settings.JOB_IMPORT_MAX_ERRORS:
+            errors.append({"line": line, "error": error})
+
+    async def flush() -> None:
+        nonlocal imported, batch, unindexed
+        created, rejected = await _import_batch(db, user.id, batch)
+        batch = []
+        imported += len(created)
+        unindexed += created
+        for line, error in rejected:
+            report(line, error)
+        if len(unindexed) >= settings.JOB_IMPORT_INDEX_BATCH_SIZE:
+            pending, unindexed = unindexed, []
+            await index_jobs(pending)
+
+    try:
+        async for line, record in parse(aiter_lines(request.stream())):
+            error = record if isinstance(record, str) else None
+            if error is None:
+                try:
+                    job = JobCreate.model_validate(record)
+                except ValidationError as e:
+                    error = "; ".join(f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors())
+                else:
+                    if not 0 <= job.title_id < len(settings.JOBS):
+                        error = "Invalid title id"
+
+            if error is not None:
+                report(line, error)
+                continue
+
+            batch.append((line, job))
+            if len(batch) >= settings.JOB_IMPORT_BATCH_SIZE:
+                await flush()
+
+        if batch:
+            await flush()
+    finally:
+        if imported:
+            job_title_index.invalidate()
+        if unindexed:
+            await index_jobs(unindexed)
+
+    errors.sort(key=lambda e: e["line"])
+    return {"imported": imported, "failed": failed, "errors": errors}
+
+
+@router.get("/my_jobs", response_model=Page[JobResponse])
+async def my_jobs(skip: int = 0, limit: int = 100, user: UserResponse = require_user("recruiter", "Access denied: only recruiter can see there jobs"), db: AsyncSession = get_db_session()) -> Response:
+    jobs = await recruiter_jobs(db, user.id)
+    total = await get_total_recruiter_jobs(db, user.id)
+
+    return page_response(JobResponse, {
+        "data": jobs,
         "total": total,
         "skip": skip,
         "limit": limit,
         "page": (skip // limit) + 1,
         "total_pages": (total + limit - 1) // limit,
-    }
+    })
 
 
 @router.delete("/remove_job", status_code=status.HTTP_204_NO_CONTENT)
-async def remove_job(token: str, job_id: int, db: Session = get_db_session()) -> None:
-    payload = decode_token(token)
-    user_id = payload.get("sub")
-    role = payload.get("role")
-
-    if not user_id or not role:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
-    if role != "recruiter":
-        raise HTTPException(status_code=403, detail="Access denied: only recruiter can delete job")
-
-    user = get_user(db, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    job = get_job(db, job_id)
+async def remove_job(job_id: int, user: UserResponse = require_user("recruiter", "Access denied: only recruiter can delete job"), db: AsyncSession = get_db_session()) -> None:
+    job = await get_job(db, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
     if str(job.recruiter_id) != str(user.id):
         raise HTTPException(status_code=403, detail="Access denied: only job's recruiter can delete that job")
     
-    delete_job(db, job_id)
+    await delete_job(db, job_id)
+    job_title_index.invalidate()
+    await unindex_job(job_id)
+
+
+def _zip_entry_name(application_id: int, filename: str) -> str:
+    """Archive name for an applicant's resume, keeping only the base name of the uploaded filename."""
+    base = path.basename(filename.replace("\\", "/")).lstrip(".") or "resume.pdf"
+    return f"{application_id}_{base}"
 
 
-@router.get("/applications")
+@router.get("/applications", response_model=Page[JobApplicationResponse])
 async def applications(
-    token: str, 
+    request: Request,
     job_id: int, 
     skip: int = 0, 
     limit: int = 100, 
-    db: Session = get_db_session()
-) -> Dict[str, Any]:
-
-    # Decode token and check role
-    payload = decode_token(token)
-    user_id = payload.get("sub")
-    role = payload.get("role")
-
-    if not user_id or not role:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
-    if role != "recruiter":
-        raise HTTPException(status_code=403, detail="Access denied: only recruiter can view applications")
-
-    # Fetch user
-    user = get_user(db, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    include_resume: bool = False,
+    user: UserResponse = require_user("recruiter", "Access denied: only recruiter can view applications"), 
+    db: AsyncSession = get_db_session()
+) -> Response:
+    """
+    List a job's applications with a download URL for each applicant's resume.
+    Pass cursor (empty for the first page, then next_cursor) for keyset pagination instead of skip.
+    With include_resume, stream the page as a zip of the resumes plus an applications.json manifest,
+    whose resume_file gives each resume's entry in the archive, or null when the file is missing on the server.
+    """
     # Fetch job
-    job = get_job(db, job_id)
+    job = await get_job(db, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
@@ -159,70 +221,126 @@ async def applications(
             detail="Access denied: only job's recruiter can see their job applications."
         )
     
-    # Fetch applications
-    applications = get_applications_by_job(db, job_id, skip, limit)
+    # Fetch applications with their applicant and resume in one query
+    after_id = decode_cursor(cursor) if cursor is not None else None
+    rows = await get_application_rows_by_job(db, job_id, skip if cursor is None else 0, limit, after_id)
     results: List[Dict[str, Any]] = []
+    storage_paths: List[str] = []
 
-    for app in applications:
-        resume = get_resume_by_user(db, cast(int, app.candidate_id))
-        if not resume:
+    for row in rows:
+        if row.resume_id is None:
             continue
 
-        # Read and encode resume as base64
-        with open(str(resume.storage_path), "rb") as f:
-            encoded_resume = base64.b64encode(f.read()).decode()
-
         results.append({
-            "application_id": app.id,
-            "applicant_name": app.candidate.name,
-            "email": app.candidate.email,
-            "resume_filename": resume.filename,
-            "resume_data": encoded_resume,
-            "similarity_score": app.similarity_score,
-            "status": app.status,
+            "application_id": row.application_id,
+            "applicant_name": row.name,
+            "email": row.email,
+            "resume_filename": row.resume_filename,
+            "resume_url": str(request.url_for("application_resume", application_id=row.application_id)),
+            "similarity_score": row.similarity_score,
+            "description_score": row.description_score,
+            "status": row.status,
         })
-        
-    total = get_total_applications_by_job(db, job_id)
+        storage_paths.append(str(row.storage_path))
+
+    if include_resume:
+        # Check the files up front: one that vanished would otherwise cut the archive off mid-stream.
+        manifest: List[Dict[str, Any]] = []
+        resume_files: List[Tuple[str, str]] = []
+        for result, storage_path in zip(results, storage_paths):
+            name = _zip_entry_name(result["application_id"], str(result["resume_filename"])) if path.exists(storage_path) else None
+            manifest.append({**result, "resume_file": name})
+            if name is not None:
+                resume_files.append((name, storage_path))
+
+        return StreamingResponse(
+            stream_zip([("applications.json", json.dumps(manifest, indent=2).encode()), *resume_files]),
+            media_type="application/zip",
+            headers={"Content-Disposition": f"attachment; filename=job_{job_id}_applications_{(skip // limit) + 1}.zip"},
+        )
 
-    return {
-        "data": results,
-        "total": total,
-        "skip": skip,
-        "limit": limit,
-        "page": (skip // limit) + 1,
-        "total_pages": (total + limit - 1) // limit,
-    }
+    total = await get_total_applications_by_job(db, job_id) if cursor is None or include_total else None
 
+    return page_response(JobApplicationResponse, paginated(results, [row.application_id for row in rows], skip, limit, cursor, total))
 
-@router.get("/update_application_status")
-async def update_application_status(token: str, application_id: int, new_status: str, db: Session=get_db_session()) -> None:
 
-    # Decode token and check role
-    payload = decode_token(token)
-    user_id = payload.get("sub")
-    role = payload.get("role")
+@router.get("/application/{application_id}/resume", name="application_resume")
+async def application_resume(request: Request, application_id: int, user: UserResponse = require_user("recruiter", "Access denied: only recruiter can download resumes"), db: AsyncSession = get_db_session()) -> Response:
+    """Download the resume of an applicant to one of the recruiter's jobs, or 304 when the client's cached copy is current."""
+    row = await get_application_resume(db, application_id)
+    if not row:
+        raise HTTPException(status_code=404, detail="No resume found for this application")
 
-    if not user_id or not role:
-        raise HTTPException(status_code=401, detail="Invalid token")
+    if str(row.recruiter_id) != str(user.id):
+        raise HTTPException(status_code=403, detail="Access denied: only job's recruiter can download its applicants' resumes.")
 
-    if role != "recruiter":
-        raise HTTPException(status_code=403, detail="Access denied: only recruiter can update application status")
+    if not path.exists(str(row.storage_path)):
+        raise HTTPException(status_code=404, detail="Resume file missing on server")
 
-    # Fetch user
-    user = get_user(db, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
+    return cached_file_response(request, str(row.storage_path), str(row.filename), content_hash=row.content_hash)
+
+
+@router.get("/job/{job_id}/top_candidates")
+async def top_candidates(job_id: int, limit: int = 20, user: UserResponse = require_user("recruiter", "Access denied: only recruiter can search candidates"), db: AsyncSession = get_db_session()) -> Dict[str, Any]:
+    """Rank the active resumes of active candidates, applied or not, by how well they match the job's title."""
+    job = await get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    if str(job.recruiter_id) != str(user.id):
+        raise HTTPException(
+            status_code=403,
+            detail="Access denied: only job's recruiter can search candidates for that job."
+        )
+
+    class_column = model_registry.current().class_index.get(str(job.title))
+    if class_column is None:
+        return {"data": [], "limit": limit}
+
+    # This worker's index may still hold candidates deactivated or deleted by another worker since it
+    # was built. Drop them and fetch a deeper slice of the ranking until the page is full.
+    results: List[Dict[str, Any]] = []
+    fetched, fetch = 0, limit
+    while limit > 0:
+        ranked = await db.run_sync(talent_index.top_k, class_column, fetch)
+        unseen, fetched = ranked[fetched:], len(ranked)
+        users = {u.id: u for u in await get_users_by_ids(db, [candidate_id for candidate_id, _, _ in unseen])}
+        resumes = {r.id: r for r in await get_resumes_by_ids(db, [resume_id for _, resume_id, _ in unseen])}
+
+        for candidate_id, resume_id, score in unseen:
+            candidate = users.get(candidate_id)
+            resume = resumes.get(resume_id)
+            if not candidate or not candidate.is_active or not resume:
+                continue
+
+            results.append({
+                "candidate_id": candidate_id,
+                "name": candidate.name,
+                "email": candidate.email,
+                "resume_id": resume_id,
+                "resume_filename": resume.filename,
+                "match_score": score,
+            })
+
+        if len(results) >= limit or len(ranked) < fetch:
+            break
+        fetch *= 2
+
+    return {"data": results[:limit], "limit": limit}
+
+
+@router.get("/update_application_status")
+async def update_application_status(application_id: int, new_status: str, user: UserResponse = require_user("recruiter", "Access denied: only recruiter can update application status"), db: AsyncSession = get_db_session()) -> None:
     if new_status not in ["applied", "accepted", "rejected"]:
         raise HTTPException(status_code=400, detail="Invalid status value")
     
     # Fetch application
-    application = crud_update_application_status(db, application_id, new_status)
+    application = await crud_update_application_status(db, application_id, new_status)
     if not application:
         raise HTTPException(status_code=404, detail="Application not found")
     
     # Verify that the recruiter owns the job related to the application
-    job = get_job(db, cast(int, application.job_id))
+    job = await get_job(db, cast(int, application.job_id))
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
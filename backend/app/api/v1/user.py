@@ -1,31 +1,38 @@
 from fastapi import APIRouter, HTTPException, status
 from datetime import datetime, timezone
 from typing import Dict, cast
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.security import verify_password, create_access_token, decode_token
-from crud.user import get_user_by_email, get_user, activate_user, deactivate_user
+from core.security import verify_and_update_password, create_access_token
+from crud.user import get_user_by_email, activate_user, deactivate_user, update_password_hash
 from crud.token import create_refresh_token, revoke_tokens_for_user
-from api.dependencies import get_db_session
+from api.dependencies import get_db_session, require_user
 from schemas.user import UserLogin, UserResponse
-from models.user import User
+from utils.talent_index import talent_index
 
 
 router = APIRouter()
 
 
 @router.post('/login')
-def login(user: UserLogin, db: Session = get_db_session()) -> Dict[str, str]:
+async def login(user: UserLogin, db: AsyncSession = get_db_session()) -> Dict[str, str]:
     """Authenticate user and return JWT access + refresh token."""
-    existing = get_user_by_email(db, user.email)
+    existing = await get_user_by_email(db, user.email)
 
     if not existing:
         raise HTTPException(status_code=404, detail='User not found')
 
-    if not verify_password(user.password, str(existing.password_hash)):
+    valid, new_hash = await verify_and_update_password(user.password, str(existing.password_hash))
+    if not valid:
         raise HTTPException(status_code=401, detail='Wrong password')
-    
-    activate_user(db, cast(int, existing.id))
+
+    if new_hash:
+        await update_password_hash(db, cast(int, existing.id), new_hash)
+
+    was_active = bool(existing.is_active)
+    await activate_user(db, cast(int, existing.id))
+    if not was_active:
+        talent_index.invalidate()
     access_token = create_access_token(
         data={
             "sub": str(existing.id),
@@ -35,7 +42,7 @@ def login(user: UserLogin, db: Session = get_db_session()) -> Dict[str, str]:
         }
     )
 
-    refresh_entry = create_refresh_token(
+    refresh_entry = await create_refresh_token(
         db,
         user_id=cast(int, existing.id),
         refresh_token_hash=access_token,
@@ -45,46 +52,20 @@ def login(user: UserLogin, db: Session = get_db_session()) -> Dict[str, str]:
 
 
 @router.get('/me', response_model=UserResponse)
-async def get_current_user(token: str, db: Session = get_db_session()) -> User:
+async def get_current_user(user: UserResponse = require_user()) -> UserResponse:
     """Get current user information."""
-    payload = decode_token(token)
-    user_id = payload.get("sub")
-    if not user_id:
-        raise HTTPException(status_code=401, detail='Invalid token')
-
-    user = get_user(db, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail='User not found')
-
     return user
 
 
 @router.delete('/deactivate_account', status_code=status.HTTP_204_NO_CONTENT)
-async def deactivate_account(token: str, db: Session = get_db_session()) -> None:
+async def deactivate_account(user: UserResponse = require_user(), db: AsyncSession = get_db_session()) -> None:
     """Deactivate current user's account."""
-    payload = decode_token(token)
-    user_id = payload.get("sub")
-    if not user_id:
-        raise HTTPException(status_code=401, detail='Invalid token')
-
-    user = get_user(db, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail='User not found')
-
-    deactivate_user(db, user_id)
-    revoke_tokens_for_user(db, user_id)
+    await deactivate_user(db, user.id)
+    await revoke_tokens_for_user(db, user.id)
+    talent_index.remove_user(user.id)
 
 
 @router.delete('/logout', status_code=status.HTTP_204_NO_CONTENT)
-async def logout(token: str, db: Session = get_db_session()) -> None:
+async def logout(user: UserResponse = require_user(), db: AsyncSession = get_db_session()) -> None:
     """Log out user and revoke tokens."""
-    payload = decode_token(token)
-    user_id = payload.get("sub")
-    if not user_id:
-        raise HTTPException(status_code=401, detail='Invalid token')
-    
-    user = get_user(db, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail='User not found')
-
-    revoke_tokens_for_user(db, user_id)
+    await revoke_tokens_for_user(db, user.id)
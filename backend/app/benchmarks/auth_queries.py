@@ -0,0 +1,98 @@
+"""
+Benchmark the SQL queries and latency that authentication adds to every request.
+
+Serves GET /api/v1/user/me from an in-memory SQLite database, once with the user cache
+disabled (every request loads the user) and once with it enabled, and reports the number
+of queries per request alongside p50/p95/p99 latency for each mode.
+
+Run from backend/app:
+    python -m benchmarks.auth_queries [--requests 500] [--users 50] [--save baseline.json]
+    python -m benchmarks.auth_queries --compare baseline.json [--tolerance 0.25]
+"""
+import argparse
+import os
+import tempfile
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from api.v1 import user
+from benchmarks.common import Timings, finish
+from core.security import create_access_token
+from crud.user import user_cache
+from database.base import Base
+from database.session import get_db
+
+from models.application import Application # pyright: ignore[reportUnusedImport]
+from models.job import Job # pyright: ignore[reportUnusedImport]
+from models.resume import Resume # pyright: ignore[reportUnusedImport]
+from models.token import Token # pyright: ignore[reportUnusedImport]
+from models.user import User
+
+
+def run(requests: int, users: int) -> Dict[str, Dict[str, float]]:
+    path = os.path.join(tempfile.mkdtemp(), "auth.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=StaticPool)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    queries = {"count": 0}
+
+    @event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+    def count_query(*_: Any) -> None: # pyright: ignore[reportUnusedFunction]
+        queries["count"] += 1
+
+    with SessionLocal() as db:
+        db.add_all([
+            User(name=f"user{i}", email=f"user{i}@example.com", password_hash="x", role="candidate")
+            for i in range(users)
+        ])
+        db.commit()
+        tokens = [
+            create_access_token({"sub": str(u.id), "role": u.role, "iat": datetime.now(timezone.utc)})
+            for u in db.query(User).all()
+        ]
+
+    async def override_get_db() -> AsyncIterator[AsyncSession]:
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(user.router, prefix="/api/v1/user")
+    app.dependency_overrides[get_db] = override_get_db
+    client = TestClient(app)
+
+    timings = Timings()
+    ttl_seconds = user_cache.ttl_seconds
+    for mode, ttl in (("uncached", 0), ("cached", ttl_seconds or 60)):
+        user_cache.clear()
+        user_cache.ttl_seconds = ttl
+        queries["count"] = 0
+        for i in range(requests):
+            with timings.measure(f"me_{mode}"):
+                client.get("/api/v1/user/me", params={"token": tokens[i % len(tokens)]})
+        print(f"{mode}: {queries['count'] / requests:.3f} queries/request")
+
+    user_cache.ttl_seconds = ttl_seconds
+    user_cache.clear()
+    return timings.summary()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--save", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", help="fail if slower than this JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before failing, as a fraction")
+    args = parser.parse_args()
+
+    finish(run(args.requests, args.users), args.save, args.compare, args.tolerance)
@@ -0,0 +1,84 @@
+import json
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+
+class Timings:
+    """Collects per-stage latencies and summarises them as percentiles and throughput."""
+
+    def __init__(self) -> None:
+        self.samples: Dict[str, List[float]] = {}
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples.setdefault(stage, []).append(time.perf_counter() - started)
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.samples.setdefault(stage, []).append(seconds)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        result: Dict[str, Dict[str, float]] = {}
+        for stage, samples in self.samples.items():
+            ms = np.array(samples) * 1000
+            result[stage] = {
+                "count": len(samples),
+                "mean_ms": float(ms.mean()),
+                "p50_ms": float(np.percentile(ms, 50)),
+                "p95_ms": float(np.percentile(ms, 95)),
+                "p99_ms": float(np.percentile(ms, 99)),
+                "ops_per_s": float(len(samples) / ms.sum() * 1000) if ms.sum() else 0.0,
+            }
+        return result
+
+
+def print_summary(summary: Dict[str, Dict[str, float]]) -> None:
+    width = max((len(stage) for stage in summary), default=5)
+    print(f"{'stage':<{width}}  {'p50 ms':>9}  {'p95 ms':>9}  {'p99 ms':>9}  {'ops/s':>10}")
+    for stage, stats in summary.items():
+        print(
+            f"{stage:<{width}}  {stats['p50_ms']:>9.3f}  {stats['p95_ms']:>9.3f}  "
+            f"{stats['p99_ms']:>9.3f}  {stats['ops_per_s']:>10.1f}"
+        )
+
+
+def save_baseline(summary: Dict[str, Dict[str, float]], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    print(f"Saved baseline to {path}")
+
+
+def compare_to_baseline(summary: Dict[str, Dict[str, float]], path: str, tolerance: float) -> bool:
+    """Print stages whose p50 or p95 got slower than the baseline by more than tolerance. Returns True if none did."""
+    with open(path, encoding="utf-8") as f:
+        baseline: Dict[str, Dict[str, float]] = json.load(f)
+
+    ok = True
+    for stage, stats in summary.items():
+        base: Optional[Dict[str, float]] = baseline.get(stage)
+        if base is None:
+            continue
+        for key in ("p50_ms", "p95_ms"):
+            limit = base[key] * (1 + tolerance)
+            if stats[key] > limit:
+                ok = False
+                print(f"REGRESSION {stage} {key}: {stats[key]:.3f} ms > {limit:.3f} ms (baseline {base[key]:.3f} ms)")
+
+    print("No regressions against baseline" if ok else f"Regressions found against {path}")
+    return ok
+
+
+def finish(summary: Dict[str, Dict[str, float]], save: Optional[str], compare: Optional[str], tolerance: float) -> None:
+    """Print, optionally save and compare a benchmark summary, exiting non-zero on regression."""
+    print_summary(summary)
+    if save:
+        save_baseline(summary, save)
+    if compare and not compare_to_baseline(summary, compare, tolerance):
+        sys.exit(1)
@@ -0,0 +1,106 @@
+"""
+Benchmark login throughput with the configured Argon2 cost.
+
+Seeds a temporary SQLite database with users, then fires POST /api/v1/user/login requests at
+the app with the given concurrency. Reports p50/p95/p99 login latency, logins per second and
+logins per second per core, where cores is the number of hashing workers the host can run at
+once. Tune the cost with the ARGON2_TIME_COST, ARGON2_MEMORY_COST, ARGON2_PARALLELISM and
+PASSWORD_HASH_WORKERS environment variables.
+
+Run from backend/app:
+    python -m benchmarks.logins [--logins 200] [--concurrency 16] [--save baseline.json]
+    python -m benchmarks.logins --compare baseline.json [--tolerance 0.25]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import AsyncIterator, Dict
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from api.v1 import user
+from benchmarks.common import Timings, finish
+from core.config import settings
+from core.security import get_password_hash, shutdown_hash_executor
+from database.base import Base
+from database.session import get_db
+
+from models.application import Application # pyright: ignore[reportUnusedImport]
+from models.job import Job # pyright: ignore[reportUnusedImport]
+from models.resume import Resume # pyright: ignore[reportUnusedImport]
+from models.token import Token # pyright: ignore[reportUnusedImport]
+from models.user import User
+
+PASSWORD = "benchmark-password"
+
+
+async def run(logins: int, concurrency: int, users: int) -> Dict[str, Dict[str, float]]:
+    path = os.path.join(tempfile.mkdtemp(), "logins.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    password_hash = get_password_hash(PASSWORD)
+    with sessionmaker(bind=engine)() as db:
+        db.add_all([
+            User(name=f"user{i}", email=f"user{i}@example.com", password_hash=password_hash, role="candidate")
+            for i in range(users)
+        ])
+        db.commit()
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_db() -> AsyncIterator[AsyncSession]:
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(user.router, prefix="/api/v1/user")
+    app.dependency_overrides[get_db] = override_get_db
+
+    timings = Timings()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def login(i: int) -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post(
+                    "/api/v1/user/login",
+                    json={"email": f"user{i % users}@example.com", "password": PASSWORD},
+                )
+                response.raise_for_status()
+                timings.add("login", time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(login(i) for i in range(logins)))
+        elapsed = time.perf_counter() - started
+
+    await async_engine.dispose()
+    shutdown_hash_executor()
+
+    cores = min(settings.PASSWORD_HASH_WORKERS, os.cpu_count() or 1)
+    print(
+        f"argon2 time_cost={settings.ARGON2_TIME_COST} memory_cost={settings.ARGON2_MEMORY_COST} "
+        f"parallelism={settings.ARGON2_PARALLELISM}, {settings.PASSWORD_HASH_WORKERS} hashing workers"
+    )
+    print(f"{logins / elapsed:.1f} logins/s, {logins / elapsed / cores:.1f} logins/s per core ({cores} cores)")
+    return timings.summary()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--save", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", help="fail if slower than this JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before failing, as a fraction")
+    args = parser.parse_args()
+
+    finish(asyncio.run(run(args.logins, args.concurrency, args.users)), args.save, args.compare, args.tolerance)
@@ -0,0 +1,213 @@
+"""
+Check that the crud/* queries are served by indexes.
+
+Seeds a temporary SQLite database, runs each crud query against it while recording the SQL
+it issues, and prints the EXPLAIN QUERY PLAN of every statement. Exits non-zero when a
+statement scans a whole table, unless the case lists that table as one it reads in full by
+design (unfiltered first pages and counts, index rebuilds). Inserts have no plan and are
+not covered.
+
+Run from backend/app:
+    python -m benchmarks.query_plans [--users 2000] [--jobs 500] [--applications 10000] [--verbose]
+
+tests/test_query_plans.py runs the same check with the default sizes under python -m pytest.
+"""
+import argparse
+import asyncio
+import inspect
+import os
+import random
+import re
+import sqlite3
+import sys
+import tempfile
+from typing import Any, Callable, FrozenSet, List, NamedTuple, Tuple
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from crud import application, job, resume, stats, token, user
+from database.base import Base
+from database.search import setup_job_search
+from database.stats import setup_site_stats
+
+from models.application import Application
+from models.job import Job
+from models.resume import Resume
+from models.site_stats import SiteStats # pyright: ignore[reportUnusedImport]
+from models.token import Token
+from models.user import User
+
+OLD_MODEL = "v1"
+MODEL = "v2"
+
+# "SCAN users", "SCAN jobs USING COVERING INDEX ..." and the like; virtual (FTS) tables are searched, not scanned.
+FULL_SCAN = re.compile(r"^SCAN (\w+)\b(?! VIRTUAL TABLE)")
+
+
+class Case(NamedTuple):
+    name: str
+    call: Callable[[AsyncSession, Session], Any]
+    scans: FrozenSet[str] = frozenset()
+
+
+def cases(candidate_id: int, recruiter_id: int, job_id: int, application_id: int, resume_id: int) -> List[Case]:
+    """Every crud query with arguments that hit seeded rows; writes come last so reads see the full data."""
+    return [
+        Case("user.get_user_by_email", lambda db, _: user.get_user_by_email(db, "user5@example.com")),
+        Case("user.get_user", lambda db, _: user.get_user(db, candidate_id)),
+        Case("user.get_users_by_ids", lambda db, _: user.get_users_by_ids(db, [candidate_id, recruiter_id])),
+        Case("user.get_users", lambda db, _: user.get_users(db, 0, 20), frozenset({"users"})),
+        Case("user.get_users(after_id)", lambda db, _: user.get_users(db, 0, 20, after_id=candidate_id)),
+        Case("user.get_total_users", lambda db, _: user.get_total_users(db), frozenset({"users"})),
+        Case("user.get_total_active_users", lambda db, _: user.get_total_active_users(db), frozenset({"users"})),
+        Case("user.get_total_candidates", lambda db, _: user.get_total_candidates(db)),
+        Case("user.get_total_recruiters", lambda db, _: user.get_total_recruiters(db)),
+        Case("token.get_tokens_for_user", lambda db, _: token.get_tokens_for_user(db, candidate_id)),
+        Case("resume.get_resume_by_user", lambda db, _: resume.get_resume_by_user(db, candidate_id)),
+        Case("resume.get_resume_by_hash", lambda db, _: resume.get_resume_by_hash(db, "hash5")),
+        Case("resume.count_resumes_by_storage_path", lambda db, _: resume.count_resumes_by_storage_path(db, "uploads/5.pdf")),
+        Case("resume.get_resumes_by_ids", lambda db, _: resume.get_resumes_by_ids(db, [resume_id])),
+        Case("resume.get_resumes_without_text", lambda _, db: resume.get_resumes_without_text(db, resume_id, 100)),
+        Case("resume.get_scored_resumes", lambda _, db: resume.get_scored_resumes(db, MODEL)),
+        Case("job.recruiter_jobs", lambda db, _: job.recruiter_jobs(db, recruiter_id)),
+        Case("job.candidate_jobs", lambda db, _: job.candidate_jobs(db, candidate_id, 0, 20), frozenset({"jobs"})),
+        Case("job.candidate_jobs(after_id)", lambda db, _: job.candidate_jobs(db, candidate_id, 0, 20, after_id=job_id)),
+        Case("job.get_total_candidate_jobs", lambda db, _: job.get_total_candidate_jobs(db, candidate_id), frozenset({"jobs"})),
+        Case("job.get_total_recruiter_jobs", lambda db, _: job.get_total_recruiter_jobs(db, recruiter_id)),
+        Case("job.get_jobs", lambda db, _: job.get_jobs(db, 0, 20), frozenset({"jobs"})),
+        Case("job.get_jobs(after_id)", lambda db, _: job.get_jobs(db, 0, 20, after_id=job_id)),
+        Case("job.get_job", lambda db, _: job.get_job(db, job_id)),
+        Case("job.get_total_jobs", lambda db, _: job.get_total_jobs(db), frozenset({"jobs"})),
+        Case("job.get_active_job_titles", lambda _, db: job.get_active_job_titles(db), frozenset({"jobs"})),
+        Case("job.get_active_job_descriptions", lambda _, db: job.get_active_job_descriptions(db), frozenset({"jobs"})),
+        Case("job.get_jobs_by_ids", lambda db, _: job.get_jobs_by_ids(db, [job_id])),
+        Case("job.search_jobs", lambda db, _: job.search_jobs(db, "engineer remote")),
+        Case("application.get_applications_by_candidate", lambda db, _: application.get_applications_by_candidate(db, candidate_id, 0, 20)),
+        Case("application.get_application", lambda db, _: application.get_application(db, application_id)),
+        Case("application.get_application_rows_by_job", lambda db, _: application.get_application_rows_by_job(db, job_id, 0, 20)),
+        Case("application.get_application_resume", lambda db, _: application.get_application_resume(db, application_id)),
+        Case("application.get_total_applications_by_job", lambda db, _: application.get_total_applications_by_job(db, job_id)),
+        Case("application.get_applied_job_ids", lambda db, _: application.get_applied_job_ids(db, candidate_id)),
+        Case("application.get_total_applications_by_candidate", lambda db, _: application.get_total_applications_by_candidate(db, candidate_id)),
+        Case("application.get_stale_score_resume_ids", lambda _, db: application.get_stale_score_resume_ids(db, MODEL, resume_id, 100)),
+        Case("application.get_stale_scores_for_resumes", lambda _, db: application.get_stale_scores_for_resumes(db, [resume_id], MODEL)),
+        Case("stats.get_site_stats", lambda db, _: stats.get_site_stats(db)),
+        Case("application.update_application_status", lambda db, _: application.update_application_status(db, application_id, "reviewed")),
+        Case("application.bulk_update_application_scores", lambda _, db: application.bulk_update_application_scores(db, [{"id": application_id, "similarity_score": 0.5, "model_version": MODEL}])),
+        Case("user.update_password_hash", lambda db, _: user.update_password_hash(db, candidate_id, "x")),
+        Case("user.deactivate_user", lambda db, _: user.deactivate_user(db, candidate_id)),
+        Case("user.activate_user", lambda db, _: user.activate_user(db, candidate_id)),
+        Case("token.create_refresh_token", lambda db, _: token.create_refresh_token(db, candidate_id, "y")),
+        Case("token.revoke_tokens_for_user", lambda db, _: token.revoke_tokens_for_user(db, candidate_id)),
+        Case("application.delete_applications_by_id", lambda db, _: application.delete_applications_by_id(db, application_id)),
+        Case("job.delete_job", lambda db, _: job.delete_job(db, job_id)),
+    ]
+
+
+def seed(db: Session, users: int, jobs: int, applications: int) -> Tuple[int, int, int, int, int]:
+    rng = random.Random(0)
+    db.add(User(name="admin", email="admin@example.com", password_hash="x", role="admin"))
+    db.add_all([
+        User(name=f"user{i}", email=f"user{i}@example.com", password_hash="x",
+             role="recruiter" if i % 5 == 0 else "candidate", is_active=i % 10 != 0)
+        for i in range(users)
+    ])
+    db.flush()
+    recruiter_ids = [row[0] for row in db.query(User.id).filter(User.role == "recruiter")]
+    candidate_ids = [row[0] for row in db.query(User.id).filter(User.role == "candidate")]
+
+    db.add_all([
+        Resume(user_id=candidate_id, filename=f"{i}.pdf", storage_path=f"uploads/{i}.pdf", content_hash=f"hash{i}",
+               text_content="python engineer", class_probs=b"\0", model_version=OLD_MODEL if i % 4 == 0 else MODEL)
+        for i, candidate_id in enumerate(candidate_ids)
+    ])
+    db.add_all([
+        Job(recruiter_id=rng.choice(recruiter_ids), title=f"Engineer {i}", description="python engineer",
+            location="remote" if i % 3 == 0 else "office", employment_type="full-time")
+        for i in range(jobs)
+    ])
+    db.flush()
+    job_ids = [row[0] for row in db.query(Job.id)]
+    resume_ids = {user_id: resume_id for resume_id, user_id in db.query(Resume.id, Resume.user_id)}
+
+    pairs = {(rng.choice(candidate_ids), rng.choice(job_ids)) for _ in range(applications)}
+    db.add_all([
+        Application(job_id=job_id, candidate_id=candidate_id, resume_id=resume_ids[candidate_id],
+                    similarity_score=rng.random(), model_version=OLD_MODEL if job_id % 4 == 0 else MODEL)
+        for candidate_id, job_id in pairs
+    ])
+    db.add_all([Token(user_id=candidate_id, refresh_token_hash="x") for candidate_id in candidate_ids[::2]])
+    db.commit()
+
+    candidate_id, job_id = next(iter(pairs))
+    application_id = db.query(Application.id).filter(Application.candidate_id == candidate_id, Application.job_id == job_id).scalar()
+    return candidate_id, recruiter_ids[0], job_id, application_id, resume_ids[candidate_id]
+
+
+def full_scans(plan: List[Tuple[Any, ...]]) -> List[str]:
+    return [m.group(1) for m in (FULL_SCAN.match(row[-1]) for row in plan) if m]
+
+
+async def run(users: int, jobs: int, applications: int, verbose: bool) -> int:
+    path = os.path.join(tempfile.mkdtemp(), "plans.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    setup_job_search(engine)
+    setup_site_stats(engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    with SessionLocal() as db:
+        ids = seed(db, users, jobs, applications)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+
+    statements: List[Tuple[str, Any]] = []
+
+    def record(_conn: Any, _cursor: Any, statement: str, parameters: Any, _context: Any, executemany: bool) -> None:
+        statements.append((statement, parameters[0] if executemany else parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+
+    explain = sqlite3.connect(path)
+    failures = 0
+    for case in cases(*ids):
+        user.user_cache.clear()
+        stats.stats_cache.clear()
+        statements.clear()
+        with SessionLocal() as sync_db:
+            async with AsyncSessionLocal() as db:
+                result = case.call(db, sync_db)
+                if inspect.isawaitable(result):
+                    await result
+
+        for statement, parameters in statements:
+            plan = explain.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+            scanned = [table for table in full_scans(plan) if table not in case.scans]
+            if scanned:
+                failures += 1
+            if scanned or verbose:
+                print(f"{'FULL SCAN of ' + ', '.join(scanned) if scanned else 'ok'}: {case.name}")
+                print(f"    {' '.join(statement.split())}")
+                for row in plan:
+                    print(f"    {row[-1]}")
+
+    explain.close()
+    await async_engine.dispose()
+    print(f"{len(cases(*ids))} crud queries checked, {failures} full table scans")
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--jobs", type=int, default=500)
+    parser.add_argument("--applications", type=int, default=10000)
+    parser.add_argument("--verbose", action="store_true", help="print the plan of every statement, not only failures")
+    args = parser.parse_args()
+
+    sys.exit(1 if asyncio.run(run(args.users, args.jobs, args.applications, args.verbose)) else 0)
@@ -0,0 +1,229 @@
+"""
+Benchmark the resume scoring hot path stage by stage.
+
+Generates synthetic resume PDFs with different page counts from the training dataset, then
+times PDF text extraction, every step of the active classifier pipeline (vectorization,
+scaling, SelectKBest, NB inference) and the Application insert against an in-memory SQLite
+database. Then times whole POST /api/v1/candidate/apply_job requests for freshly uploaded
+resumes, whose text extraction, inference and description scoring run in the scoring process
+pool, so the pool's overhead shows up next to the sum of the stages. Reports p50/p95/p99
+latency and throughput per stage.
+
+Run from backend/app:
+    python -m benchmarks.scoring [--pages 1 3 10] [--iterations 30] [--save baseline.json]
+    python -m benchmarks.scoring --compare baseline.json [--tolerance 0.25]
+"""
+import argparse
+import asyncio
+import csv
+import os
+import tempfile
+import time
+from typing import AsyncIterator, List
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, delete
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from api.v1 import candidate
+from benchmarks.common import Timings, finish
+from core.security import create_access_token
+from database.base import Base
+from database.session import get_db
+from utils.description_index import job_description_index
+from utils.model_registry import model_registry
+from utils.scoring_executor import shutdown_scoring_executor, warm_scoring_executor
+from utils.simmilarity_score import extract_text_from_pdf
+
+from models.application import Application
+from models.job import Job
+from models.resume import Resume
+from models.token import Token # pyright: ignore[reportUnusedImport]
+from models.user import User
+
+DATASET_PATH = "ml/datasets/ResumeDataSet.csv"
+LINES_PER_PAGE = 55
+CHARS_PER_LINE = 90
+
+
+def load_corpus_words() -> List[str]:
+    words: List[str] = []
+    with open(DATASET_PATH, encoding="utf-8", errors="ignore", newline="") as f:
+        for row in csv.DictReader(f):
+            words.extend(row["Resume"].split())
+    return words
+
+
+def _pdf_escape(line: str) -> str:
+    line = line.encode("latin-1", "ignore").decode("latin-1")
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_resume_pdf(path: str, words: List[str], pages: int, offset: int) -> None:
+    """Write a plain text PDF with the given number of full pages, using corpus words from offset onwards."""
+    page_lines: List[List[str]] = []
+    position = offset
+    for _ in range(pages):
+        lines: List[str] = []
+        while len(lines) < LINES_PER_PAGE:
+            line = ""
+            while len(line) < CHARS_PER_LINE:
+                line += words[position % len(words)] + " "
+                position += 1
+            lines.append(line)
+        page_lines.append(lines)
+
+    objects: List[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids: List[str] = []
+    for lines in page_lines:
+        body = "BT /F1 9 Tf 11 TL 40 760 Td " + " ".join(f"({_pdf_escape(l)}) Tj T*" for l in lines) + " ET"
+        stream = body.encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets: List[int] = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + obj + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % o for o in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+async def time_apply_job(timings: Timings, words: List[str], pages: List[int], iterations: int, tmp_dir: str) -> None:
+    """Time apply_job end to end, each time for a new resume with no stored text or class probabilities."""
+    model = model_registry.current()
+    path = os.path.join(tmp_dir, "apply.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(bind=engine)
+    with SessionLocal() as db:
+        candidate_user = User(role="candidate", name="bench", email="bench@example.com", password_hash="x")
+        recruiter = User(role="recruiter", name="recruiter", email="recruiter@example.com", password_hash="x")
+        db.add_all([candidate_user, recruiter])
+        db.flush()
+        jobs = [
+            Job(recruiter_id=recruiter.id, title=next(iter(model.class_index)), location="remote",
+                description=" ".join(words[i * 50:(i + 1) * 50]))
+            for i in range(len(pages) * iterations)
+        ]
+        db.add_all(jobs)
+        db.commit()
+        candidate_id = int(candidate_user.id)
+        job_ids = [int(job.id) for job in jobs]
+
+    # Scoring processes read the description index from DESCRIPTION_INDEX_DIR, so point it at the scratch
+    # directory before the pool starts them, and build it for the benchmark's jobs.
+    os.environ["DESCRIPTION_INDEX_DIR"] = job_description_index.root = os.path.join(tmp_dir, "indexes")
+    with SessionLocal() as db:
+        job_description_index.rebuild(db)
+    warm_scoring_executor()
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_db() -> AsyncIterator[AsyncSession]:
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(candidate.router, prefix="/api/v1/candidate")
+    app.dependency_overrides[get_db] = override_get_db
+    token = create_access_token(data={"sub": str(candidate_id), "role": "candidate"})
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        job_iter = iter(job_ids)
+        for page_count in pages:
+            for i in range(iterations):
+                pdf_path = os.path.join(tmp_dir, f"apply_{page_count}_{i}.pdf")
+                write_resume_pdf(pdf_path, words, page_count, offset=i * 997)
+                with SessionLocal() as db:
+                    db.execute(delete(Resume).where(Resume.user_id == candidate_id))
+                    db.add(Resume(user_id=candidate_id, filename="bench.pdf", storage_path=pdf_path))
+                    db.commit()
+
+                with timings.measure(f"apply_job[{page_count}p]"):
+                    response = await client.post("/api/v1/candidate/apply_job", params={"job_id": next(job_iter), "token": token})
+                response.raise_for_status()
+
+    await async_engine.dispose()
+    shutdown_scoring_executor()
+
+
+def run(pages: List[int], iterations: int) -> Timings:
+    timings = Timings()
+    model = model_registry.current()
+    words = load_corpus_words()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    user = User(role="candidate", name="bench", email="bench@example.com", password_hash="x")
+    db.add(user)
+    db.flush()
+    job = Job(recruiter_id=user.id, title=next(iter(model.class_index)), location="remote")
+    resume = Resume(user_id=user.id, filename="bench.pdf", storage_path="bench.pdf")
+    db.add_all([job, resume])
+    db.commit()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for page_count in pages:
+            for i in range(iterations):
+                path = os.path.join(tmp_dir, f"resume_{page_count}_{i}.pdf")
+                write_resume_pdf(path, words, page_count, offset=i * 997)
+                started = time.perf_counter()
+
+                with timings.measure(f"extract[{page_count}p]"):
+                    text = extract_text_from_pdf(path)
+
+                data = [text]
+                steps = getattr(model.pipeline, "steps", [("model", model.pipeline)])
+                for name, step in steps[:-1]:
+                    with timings.measure(f"{name}[{page_count}p]"):
+                        data = step.transform(data)
+
+                final_name, final_step = steps[-1]
+                with timings.measure(f"{final_name}.predict_proba[{page_count}p]"):
+                    probs = final_step.predict_proba(data)[0]
+
+                with timings.measure(f"db_write[{page_count}p]"):
+                    db.add(Application(candidate_id=user.id, job_id=job.id, resume_id=resume.id,
+                                       status="applied", similarity_score=float(probs[0]),
+                                       model_version=model.version))
+                    db.commit()
+
+                timings.add(f"total[{page_count}p]", time.perf_counter() - started)
+
+        asyncio.run(time_apply_job(timings, words, pages, iterations, tmp_dir))
+
+    db.close()
+    return timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 3, 10])
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--save", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", help="fail if slower than this JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before failing, as a fraction")
+    args = parser.parse_args()
+
+    finish(run(args.pages, args.iterations).summary(), args.save, args.compare, args.tolerance)
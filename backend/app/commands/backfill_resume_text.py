@@ -0,0 +1,49 @@
+"""
+Store extracted text for resumes uploaded before text extraction was persisted.
+
+Run from backend/app:
+    python -m commands.backfill_resume_text [--batch-size 100]
+"""
+import argparse
+from typing import cast
+
+from database.session import get_sync_session
+from crud.resume import get_resumes_without_text
+from utils.simmilarity_score import extract_text_from_pdf
+
+from models.application import Application # pyright: ignore[reportUnusedImport]
+from models.job import Job # pyright: ignore[reportUnusedImport]
+from models.token import Token # pyright: ignore[reportUnusedImport]
+from models.user import User # pyright: ignore[reportUnusedImport]
+
+
+def backfill_resume_text(batch_size: int = 100) -> int:
+    """Extract and store text for every resume that has none. Returns the number of rows updated."""
+    updated = 0
+    last_id = 0
+
+    while True:
+        with get_sync_session() as db:
+            resumes = get_resumes_without_text(db, last_id, batch_size)
+            if not resumes:
+                break
+
+            for resume in resumes:
+                text = extract_text_from_pdf(str(resume.storage_path))
+                if text:
+                    setattr(resume, "text_content", text)
+                    updated += 1
+            last_id = cast(int, resumes[-1].id)
+
+        print(f"Processed resumes up to id {last_id}, {updated} updated so far")
+
+    return updated
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
+    total = backfill_resume_text(args.batch_size)
+    print(f"Backfilled text for {total} resumes")
@@ -0,0 +1,26 @@
+"""
+Add a trained resume classifier to the model registry.
+
+Run from backend/app:
+    python -m commands.register_model ml/models/resume_classifier_cnb.pkl [--activate] [--note "..."]
+
+Running workers switch to an activated version within MODEL_RELOAD_SECONDS.
+"""
+import argparse
+
+from utils.model_registry import model_registry
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("artifact", help="pickled or joblib-dumped pipeline")
+    parser.add_argument("--activate", action="store_true", help="make it the active version")
+    parser.add_argument("--note", default="", help="free-form note stored in the version metadata")
+    args = parser.parse_args()
+
+    version = model_registry.register(args.artifact, {"note": args.note})
+    print(f"Registered model version {version}")
+
+    if args.activate:
+        model_registry.activate(version)
+        print(f"Activated model version {version}")
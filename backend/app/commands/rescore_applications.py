@@ -0,0 +1,80 @@
+"""
+Recompute Application.similarity_score for every application scored by an older model.
+
+Applications are processed in chunks of resumes: each chunk runs predict_proba once over
+all of its resume texts and writes the new scores back with a bulk UPDATE. Every chunk is
+committed on its own and only applications whose model_version differs from the loaded
+model are selected, so an interrupted run picks up where it stopped.
+
+Run from backend/app:
+    python -m commands.rescore_applications [--batch-size 500]
+"""
+import argparse
+import time
+from typing import Any, Dict, List, cast
+
+from database.session import get_sync_session
+from crud.application import bulk_update_application_scores, get_stale_score_resume_ids, get_stale_scores_for_resumes
+from utils.simmilarity_score import get_resume_text, predict_resume_probs_batch
+from utils.model_registry import model_registry
+from models.resume import Resume
+
+from models.application import Application # pyright: ignore[reportUnusedImport]
+from models.job import Job # pyright: ignore[reportUnusedImport]
+from models.token import Token # pyright: ignore[reportUnusedImport]
+from models.user import User # pyright: ignore[reportUnusedImport]
+
+
+def rescore_applications(batch_size: int = 500) -> int:
+    """Rescore all stale applications. Returns the number of applications updated."""
+    model = model_registry.current()
+    started = time.perf_counter()
+    rescored = 0
+    resumes_done = 0
+    last_resume_id = 0
+
+    while True:
+        with get_sync_session() as db:
+            resume_ids = get_stale_score_resume_ids(db, model.version, last_resume_id, batch_size)
+            if not resume_ids:
+                break
+            last_resume_id = resume_ids[-1]
+
+            resumes = db.query(Resume).filter(Resume.id.in_(resume_ids)).all()
+            probs = predict_resume_probs_batch([get_resume_text(r) for r in resumes], model)
+
+            row_by_resume: Dict[int, int] = {}
+            for row, resume in enumerate(resumes):
+                row_by_resume[cast(int, resume.id)] = row
+                setattr(resume, "class_probs", probs[row].tobytes())
+                setattr(resume, "model_version", model.version)
+
+            scores: List[Dict[str, Any]] = []
+            for app_id, resume_id, job_title in get_stale_scores_for_resumes(db, resume_ids, model.version):
+                row = row_by_resume.get(resume_id)
+                if row is None:
+                    continue
+                col = model.class_index.get(job_title)
+                score = float(probs[row, col]) if col is not None else 0.0
+                scores.append({"id": app_id, "similarity_score": score, "model_version": model.version})
+
+            bulk_update_application_scores(db, scores)
+
+        rescored += len(scores)
+        resumes_done += len(resume_ids)
+        elapsed = time.perf_counter() - started
+        print(
+            f"{rescored} applications / {resumes_done} resumes rescored "
+            f"({rescored / elapsed:.0f} applications/s, {resumes_done / elapsed:.0f} resumes/s)"
+        )
+
+    return rescored
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=500, help="resumes per chunk")
+    args = parser.parse_args()
+
+    total = rescore_applications(args.batch_size)
+    print(f"Rescored {total} applications with model {model_registry.current().version}")
@@ -2,7 +2,7 @@ from pydantic_settings import BaseSettings
 from pydantic import Field
 from typing import List, Dict
 from dotenv import load_dotenv
-from os import getenv
+from os import getenv, cpu_count
 import json
 
 
@@ -30,6 +30,98 @@ class Settings(BaseSettings):
         default_factory=lambda: int(getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "1440"))
     )
 
+    SCORING_WORKERS: int = Field(
+        default_factory=lambda: int(getenv("SCORING_WORKERS", str(cpu_count() or 1)))
+    )
+
+    SCORING_MAX_PENDING: int = Field(
+        default_factory=lambda: int(getenv("SCORING_MAX_PENDING", "64"))
+    )
+
+    SCORING_TIMEOUT_SECONDS: float = Field(
+        default_factory=lambda: float(getenv("SCORING_TIMEOUT_SECONDS", "30"))
+    )
+
+    ARGON2_TIME_COST: int = Field(
+        default_factory=lambda: int(getenv("ARGON2_TIME_COST", "3"))
+    )
+
+    ARGON2_MEMORY_COST: int = Field(
+        default_factory=lambda: int(getenv("ARGON2_MEMORY_COST", "65536"))
+    )
+
+    ARGON2_PARALLELISM: int = Field(
+        default_factory=lambda: int(getenv("ARGON2_PARALLELISM", "4"))
+    )
+
+    PASSWORD_HASH_WORKERS: int = Field(
+        default_factory=lambda: int(getenv("PASSWORD_HASH_WORKERS", str(cpu_count() or 1)))
+    )
+
+    PASSWORD_HASH_MAX_PENDING: int = Field(
+        default_factory=lambda: int(getenv("PASSWORD_HASH_MAX_PENDING", "256"))
+    )
+
+    MODEL_REGISTRY_DIR: str = Field(
+        default_factory=lambda: getenv("MODEL_REGISTRY_DIR", "ml/models/registry")
+    )
+
+    MODEL_FALLBACK_PATH: str = Field(
+        default_factory=lambda: getenv("MODEL_FALLBACK_PATH", "ml/models/resume_classifier_cnb.pkl")
+    )
+
+    MODEL_RELOAD_SECONDS: int = Field(
+        default_factory=lambda: int(getenv("MODEL_RELOAD_SECONDS", "30"))
+    )
+
+    JOB_INDEX_TTL_SECONDS: int = Field(
+        default_factory=lambda: int(getenv("JOB_INDEX_TTL_SECONDS", "60"))
+    )
+
+    TALENT_INDEX_TTL_SECONDS: int = Field(
+        default_factory=lambda: int(getenv("TALENT_INDEX_TTL_SECONDS", "300"))
+    )
+
+    STATS_CACHE_TTL_SECONDS: int = Field(
+        default_factory=lambda: int(getenv("STATS_CACHE_TTL_SECONDS", "5"))
+    )
+
+    STATS_RECONCILE_MINUTES: int = Field(
+        default_factory=lambda: int(getenv("STATS_RECONCILE_MINUTES", "60"))
+    )
+
+    DESCRIPTION_INDEX_DIR: str = Field(
+        default_factory=lambda: getenv("DESCRIPTION_INDEX_DIR", "ml/indexes")
+    )
+
+    JOB_IMPORT_BATCH_SIZE: int = Field(
+        default_factory=lambda: int(getenv("JOB_IMPORT_BATCH_SIZE", "1000"))
+    )
+
+    JOB_IMPORT_INDEX_BATCH_SIZE: int = Field(
+        default_factory=lambda: int(getenv("JOB_IMPORT_INDEX_BATCH_SIZE", "10000"))
+    )
+
+    JOB_IMPORT_MAX_ERRORS: int = Field(
+        default_factory=lambda: int(getenv("JOB_IMPORT_MAX_ERRORS", "1000"))
+    )
+
+    EXPORT_BATCH_SIZE: int = Field(
+        default_factory=lambda: int(getenv("EXPORT_BATCH_SIZE", "1000"))
+    )
+
+    SCHEDULER_LOCK_PATH: str = Field(
+        default_factory=lambda: getenv("SCHEDULER_LOCK_PATH", "scheduler.lock")
+    )
+
+    USER_CACHE_TTL_SECONDS: int = Field(
+        default_factory=lambda: int(getenv("USER_CACHE_TTL_SECONDS", "60"))
+    )
+
+    USER_CACHE_SIZE: int = Field(
+        default_factory=lambda: int(getenv("USER_CACHE_SIZE", "10000"))
+    )
+
     ADMINS: List[Dict[str, str]] = Field(
         default_factory=lambda: json.load(open("core/admins.json", encoding="utf-8")) or []
     )
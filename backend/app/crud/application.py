@@ -1,51 +1,159 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import Optional, List
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Row, delete, func, insert, or_, select, update
+from typing import Optional, List, Dict, Any, Tuple
 
-from utils.simmilarity_score import simimilarity_score
 from models.application import Application
+from models.job import Job
+from models.resume import Resume
+from models.user import User
 
 
-def apply_for_job(db: Session, candidate_id: int, job_id: int, resume_id: int, cover_letter: Optional[List[str]] = None) -> Application:
-    simmilarity_score = simimilarity_score(db, resume_id, job_id)
+async def apply_for_job(db: AsyncSession, candidate_id: int, job_id: int, resume_id: int, similarity_score: float, model_version: str, cover_letter: Optional[List[str]] = None, description_score: Optional[float] = None) -> Application:
     db_app = Application(
         candidate_id=candidate_id,
         job_id=job_id,
         resume_id=resume_id,
         cover_letter=cover_letter,
         status="applied",
-        similarity_score=simmilarity_score,
+        similarity_score=similarity_score,
+        description_score=description_score,
+        model_version=model_version,
     )
     db.add(db_app)
-    db.commit()
-    db.refresh(db_app)
+    await db.commit()
+    await db.refresh(db_app)
     return db_app
 
 
-def get_applications_by_candidate(db: Session, candidate_id: int, skip: int, limit: int) -> List[Application]:
-    return db.query(Application).filter(Application.candidate_id == candidate_id).offset(skip).limit(limit).all()
+async def apply_for_jobs(db: AsyncSession, candidate_id: int, resume_id: int, model_version: str, scores: List[Tuple[int, float, Optional[float]]]) -> List[Application]:
+    """
+    Insert one application per (job_id, similarity_score, description_score) with a single
+    INSERT ... RETURNING and commit them, and anything else pending on the session, together.
+    """
+    rows = [
+        {
+            "candidate_id": candidate_id,
+            "job_id": job_id,
+            "resume_id": resume_id,
+            "status": "applied",
+            "similarity_score": similarity_score,
+            "description_score": description_score,
+            "model_version": model_version,
+        }
+        for job_id, similarity_score, description_score in scores
+    ]
+    applications: List[Application] = []
+    if rows:
+        applications = list(await db.scalars(insert(Application).returning(Application), rows))
+    await db.commit()
+    return applications
 
 
-def delete_applications_by_id(db: Session, application_id: int) -> None:
-    db.query(Application).filter(Application.id == application_id).delete(synchronize_session=False)
-    db.commit()
+async def get_applications_by_candidate(db: AsyncSession, candidate_id: int, skip: int, limit: int, after_id: Optional[int] = None) -> List[Application]:
+    query = select(Application).where(Application.candidate_id == candidate_id)
+    if after_id is not None:
+        query = query.where(Application.id > after_id)
+    return list(await db.scalars(query.order_by(Application.id).offset(skip).limit(limit)))
 
 
-def get_applications_by_job(db: Session, job_id: int, skip: int, limit: int) -> List[Application]:
-    return db.query(Application).filter(Application.job_id == job_id).offset(skip).limit(limit).all()
+async def get_application(db: AsyncSession, application_id: int) -> Optional[Application]:
+    return await db.scalar(select(Application).where(Application.id == application_id))
 
 
-def get_total_applications_by_job(db: Session, job_id: int) -> int:
-    return db.query(func.count(Application.id)).filter(Application.job_id == job_id).scalar()
+async def delete_applications_by_id(db: AsyncSession, application_id: int) -> None:
+    await db.execute(delete(Application).where(Application.id == application_id), execution_options={"synchronize_session": False})
+    await db.commit()
 
 
-def update_application_status(db: Session, application_id: int, new_status: str) -> Optional[Application]:
-    app = db.query(Application).filter(Application.id == application_id).first()
+async def get_application_rows_by_job(db: AsyncSession, job_id: int, skip: int, limit: int, after_id: Optional[int] = None) -> List[Row[Any]]:
+    """
+    Return one row per application of the job with the applicant's name and email and their current
+    resume's id, filename and storage path (None when they have no resume), in a single joined query.
+    """
+    query = (
+        select(
+            Application.id.label("application_id"),
+            Application.similarity_score,
+            Application.description_score,
+            Application.status,
+            User.name,
+            User.email,
+            Resume.id.label("resume_id"),
+            Resume.filename.label("resume_filename"),
+            Resume.storage_path,
+        )
+        .join(User, User.id == Application.candidate_id)
+        .outerjoin(Resume, Resume.user_id == Application.candidate_id)
+        .where(Application.job_id == job_id)
+    )
+    if after_id is not None:
+        query = query.where(Application.id > after_id)
+    result = await db.execute(query.order_by(Application.id).offset(skip).limit(limit))
+    return list(result.all())
+
+
+async def get_application_resume(db: AsyncSession, application_id: int) -> Optional[Row[Any]]:
+    """Return the job's recruiter id and the applicant's current resume filename, storage path and content hash."""
+    result = await db.execute(
+        select(Job.recruiter_id, Resume.filename, Resume.storage_path, Resume.content_hash)
+        .select_from(Application)
+        .join(Job, Job.id == Application.job_id)
+        .join(Resume, Resume.user_id == Application.candidate_id)
+        .where(Application.id == application_id)
+    )
+    return result.first()
+
+
+async def get_total_applications_by_job(db: AsyncSession, job_id: int) -> int:
+    return await db.scalar(select(func.count(Application.id)).where(Application.job_id == job_id)) or 0
+
+
+async def update_application_status(db: AsyncSession, application_id: int, new_status: str) -> Optional[Application]:
+    app = await get_application(db, application_id)
     if app:
         setattr(app, "status", new_status)
-        db.commit()
-        db.refresh(app)
+        await db.commit()
+        await db.refresh(app)
     return app
 
-def get_total_applications_by_candidate(db: Session, candidate_id: int) -> int:
-    return db.query(func.count(Application.id)).filter(Application.candidate_id == candidate_id).scalar()
+async def get_applied_job_ids(db: AsyncSession, candidate_id: int) -> List[int]:
+    return list(await db.scalars(select(Application.job_id).where(Application.candidate_id == candidate_id)))
+
+async def get_total_applications_by_candidate(db: AsyncSession, candidate_id: int) -> int:
+    return await db.scalar(select(func.count(Application.id)).where(Application.candidate_id == candidate_id)) or 0
+
+
+def _stale_score_filter(model_version: str):
+    return or_(Application.model_version.is_(None), Application.model_version != model_version)
+
+
+def get_stale_score_resume_ids(db: Session, model_version: str, after_resume_id: int, limit: int) -> List[int]:
+    rows = (
+        db.query(Application.resume_id)
+        .filter(Application.resume_id > after_resume_id)
+        .filter(_stale_score_filter(model_version))
+        .distinct()
+        .order_by(Application.resume_id)
+        .limit(limit)
+        .all()
+    )
+    return [row[0] for row in rows]
+
+
+def get_stale_scores_for_resumes(db: Session, resume_ids: List[int], model_version: str) -> List[Tuple[int, int, str]]:
+    """Return (application id, resume id, job title) for applications of these resumes scored by another model."""
+    rows = (
+        db.query(Application.id, Application.resume_id, Job.title)
+        .join(Job, Job.id == Application.job_id)
+        .filter(Application.resume_id.in_(resume_ids))
+        .filter(_stale_score_filter(model_version))
+        .all()
+    )
+    return [(row[0], row[1], row[2]) for row in rows]
+
+
+def bulk_update_application_scores(db: Session, scores: List[Dict[str, Any]]) -> None:
+    """Write many {id, similarity_score, model_version} rows with one executemany UPDATE."""
+    if scores:
+        db.execute(update(Application), scores)
@@ -0,0 +1,37 @@
+from sqlalchemy import Row, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+from typing import Any, AsyncIterator, Dict, Sequence, Tuple
+
+from core.config import settings
+from models.application import Application
+from models.job import Job
+from models.user import User
+
+# Columns written by the admin exports, in output order; the first is the id rows are ordered by.
+EXPORT_COLUMNS: Dict[str, Tuple[InstrumentedAttribute[Any], ...]] = {
+    "users": (User.id, User.name, User.email, User.role, User.is_active, User.created_at, User.updated_at),
+    "jobs": (
+        Job.id, Job.recruiter_id, Job.title, Job.description, Job.location, Job.employment_type,
+        Job.is_active, Job.created_at, Job.updated_at,
+    ),
+    "applications": (
+        Application.id, Application.job_id, Application.candidate_id, Application.resume_id, Application.status,
+        Application.similarity_score, Application.description_score, Application.model_version, Application.applied_at,
+    ),
+}
+
+
+async def stream_export_rows(db: AsyncSession, entity: str) -> AsyncIterator[Sequence[Row[Any]]]:
+    """
+    Yield every row of the entity in id order, EXPORT_BATCH_SIZE rows at a time, read through a
+    server-side cursor so only one batch is held in memory.
+    """
+    columns = EXPORT_COLUMNS[entity]
+    result = await db.stream(
+        select(*columns)
+        .order_by(columns[0])
+        .execution_options(stream_results=True, yield_per=settings.EXPORT_BATCH_SIZE)
+    )
+    async for rows in result.partitions():
+        yield rows
@@ -1,13 +1,15 @@
+import re
 from sqlalchemy.orm import Session
-from typing import Optional, List
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Optional, List, Tuple
+from sqlalchemy import Select, and_, delete, func, insert, or_, select, text
 
 from core.security import settings
 from models.job import Job
 from models.application import Application
 from schemas.job import JobCreate
 
-def create_job(db: Session, recruiter_id: int, job: JobCreate) -> Job:
+async def create_job(db: AsyncSession, recruiter_id: int, job: JobCreate) -> Job:
     db_job = Job(
         recruiter_id=recruiter_id,
         title=settings.JOBS[job.title_id],
@@ -16,48 +18,122 @@ def create_job(db: Session, recruiter_id: int, job: JobCreate) -> Job:
         employment_type=job.employment_type,
     )
     db.add(db_job)
-    db.commit()
-    db.refresh(db_job)
+    await db.commit()
+    await db.refresh(db_job)
     return db_job
 
 
-def delete_job(db: Session, job_id: int) -> None:
-    db.query(Job).filter(Job.id == job_id).delete(synchronize_session=False)
-    db.commit()
+async def create_jobs(db: AsyncSession, recruiter_id: int, jobs: List[JobCreate]) -> List[Job]:
+    """Insert many jobs with one batched INSERT ... RETURNING and commit them together."""
+    created = list(await db.scalars(
+        insert(Job).returning(Job),
+        [
+            {
+                "recruiter_id": recruiter_id,
+                "title": settings.JOBS[job.title_id],
+                "description": job.description,
+                "location": job.location,
+                "employment_type": job.employment_type,
+            }
+            for job in jobs
+        ],
+    ))
+    await db.commit()
+    return created
+
+
+async def delete_job(db: AsyncSession, job_id: int) -> None:
+    await db.execute(delete(Job).where(Job.id == job_id), execution_options={"synchronize_session": False})
+    await db.commit()
+
+
+async def recruiter_jobs(db: AsyncSession, recruiter_id: int) -> List[Job]:
+    return list(await db.scalars(select(Job).where(Job.recruiter_id == recruiter_id)))
+
+
+def _not_applied(query: Select[Any], candidate_id: int) -> Select[Any]:
+    """Anti-join: keep the jobs the candidate has no application for, probing (candidate_id, job_id) per job."""
+    return (
+        query
+        .outerjoin(Application, and_(Application.job_id == Job.id, Application.candidate_id == candidate_id))
+        .where(Application.id.is_(None))
+    )
 
 
-def recruiter_jobs(db: Session, recruiter_id: int) -> List[Job]:
-    return db.query(Job).filter(Job.recruiter_id == recruiter_id).all()
+async def candidate_jobs(db: AsyncSession, candidate_id: int, skip: int, limit: int, after_id: Optional[int] = None):
+    query = _not_applied(select(Job), candidate_id)
+    if after_id is not None:
+        query = query.where(Job.id > after_id)
+    return list(await db.scalars(query.order_by(Job.id).offset(skip).limit(limit)))
 
 
-def candidate_jobs(db: Session, candidate_id: int, skip: int, limit: int):
-    applied_job_ids = (
-        db.query(Application.job_id)
-        .filter(Application.candidate_id == candidate_id)
-    )
+async def get_total_candidate_jobs(db: AsyncSession, candidate_id: int) -> int:
+    return await db.scalar(_not_applied(select(func.count(Job.id)), candidate_id)) or 0
 
-    return db.query(Job).filter(Job.id.notin_(applied_job_ids)).offset(skip).limit(limit).all()
 
+async def get_total_recruiter_jobs(db: AsyncSession, recruiter_id: int) -> int:
+    return await db.scalar(select(func.count(Job.id)).where(Job.recruiter_id == recruiter_id)) or 0
 
-def get_total_candidate_jobs(db: Session, candidate_id: int) -> int:
-    applied_job_ids = (
-        db.query(Application.job_id)
-        .filter(Application.candidate_id == candidate_id)
-    )
 
-    return db.query(func.count(Job.id)).filter(Job.id.notin_(applied_job_ids)).scalar()
+async def get_jobs(db: AsyncSession, skip: int = 0, limit: int = 10, after_id: Optional[int] = None) -> List[Job]:
+    query = select(Job)
+    if after_id is not None:
+        query = query.where(Job.id > after_id)
+    return list(await db.scalars(query.order_by(Job.id).offset(skip).limit(limit)))
+
+
+async def get_job(db: AsyncSession, job_id: int) -> Optional[Job]:
+    return await db.scalar(select(Job).where(Job.id == job_id))
+
+async def get_total_jobs(db: AsyncSession) -> int:
+    return await db.scalar(select(func.count(Job.id))) or 0
+
+
+def get_active_job_titles(db: Session) -> List[Tuple[int, str]]:
+    rows = db.query(Job.id, Job.title).filter(Job.is_active == True).order_by(Job.id).all()
+    return [(row[0], row[1]) for row in rows]
+
+
+def get_active_job_descriptions(db: Session) -> List[Tuple[int, Optional[str]]]:
+    rows = db.query(Job.id, Job.description).filter(Job.is_active == True).order_by(Job.id).all()
+    return [(row[0], row[1]) for row in rows]
+
+
+async def get_jobs_by_ids(db: AsyncSession, job_ids: List[int]) -> List[Job]:
+    """Fetch jobs by id, keeping the order of job_ids."""
+    jobs = {job.id: job for job in await db.scalars(select(Job).where(Job.id.in_(job_ids)))}
+    return [jobs[job_id] for job_id in job_ids if job_id in jobs]
+
 
+SQLITE_SEARCH = text("""
+    SELECT jobs.* FROM jobs_fts
+    JOIN jobs ON jobs.id = jobs_fts.rowid
+    WHERE jobs_fts MATCH :query AND jobs.is_active
+    ORDER BY bm25(jobs_fts, 10.0, 1.0, 5.0)
+    LIMIT :limit OFFSET :skip
+""")
 
-def get_total_recruiter_jobs(db: Session, recruiter_id: int) -> int:
-    return db.query(func.count(Job.id)).filter(Job.recruiter_id == recruiter_id).scalar()
+POSTGRES_SEARCH = text("""
+    SELECT jobs.* FROM jobs, websearch_to_tsquery('english', :query) AS query
+    WHERE jobs.search_vector @@ query AND jobs.is_active
+    ORDER BY ts_rank(jobs.search_vector, query) DESC
+    LIMIT :limit OFFSET :skip
+""")
 
 
-def get_jobs(db: Session, skip: int = 0, limit: int = 10) -> List[Job]:
-    return db.query(Job).offset(skip).limit(limit).all()
+async def search_jobs(db: AsyncSession, query: str, skip: int = 0, limit: int = 10) -> List[Job]:
+    """Full-text search over job title, description and location, best matches first."""
+    terms = re.findall(r"\w+", query)
+    if not terms:
+        return []
 
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        match = " ".join(f'"{term}"*' for term in terms)
+        return list(await db.scalars(select(Job).from_statement(SQLITE_SEARCH), {"query": match, "skip": skip, "limit": limit}))
 
-def get_job(db: Session, job_id: int) -> Optional[Job]:
-    return db.query(Job).filter(Job.id == job_id).first()
+    if dialect == "postgresql":
+        return list(await db.scalars(select(Job).from_statement(POSTGRES_SEARCH), {"query": query, "skip": skip, "limit": limit}))
 
-def get_total_jobs(db: Session) -> int:
-    return db.query(func.count(Job.id)).scalar()
+    filters = [or_(Job.title.ilike(f"%{t}%"), Job.description.ilike(f"%{t}%"), Job.location.ilike(f"%{t}%")) for t in terms]
+    return list(await db.scalars(select(Job).where(Job.is_active == True, *filters).order_by(Job.id).offset(skip).limit(limit)))
@@ -1,19 +1,73 @@
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
+from typing import List, Optional, Tuple
 
 from models.resume import Resume
+from models.user import User
 
-def create_resume(db: Session, user_id: int, filename: str, storage_path: str, parsed_skills: Optional[List[str]] = None) -> Resume:
+async def create_resume(db: AsyncSession, user_id: int, filename: str, storage_path: str, parsed_skills: Optional[List[str]] = None, text_content: Optional[str] = None, class_probs: Optional[bytes] = None, model_version: Optional[str] = None, content_hash: Optional[str] = None, replacing: Optional[Resume] = None) -> Resume:
+    """Create a resume, deleting the one it replaces in the same transaction."""
+    if replacing is not None:
+        await db.delete(replacing)
     db_resume = Resume(
         user_id=user_id,
         filename=filename,
-        storage_path=storage_path
+        storage_path=storage_path,
+        content_hash=content_hash,
+        text_content=text_content,
+        class_probs=class_probs,
+        model_version=model_version,
     )
     db.add(db_resume)
-    db.commit()
-    db.refresh(db_resume)
+    await db.commit()
+    await db.refresh(db_resume)
     return db_resume
 
 
-def get_resume_by_user(db: Session, user_id: int) -> Resume | None:
-    return db.query(Resume).filter(Resume.user_id == user_id).first()
+async def get_resume_by_user(db: AsyncSession, user_id: int) -> Resume | None:
+    return await db.scalar(select(Resume).where(Resume.user_id == user_id))
+
+
+async def get_resume_by_hash(db: AsyncSession, content_hash: str) -> Resume | None:
+    """Return a resume with the same file content whose extracted text is already stored."""
+    return await db.scalar(
+        select(Resume)
+        .where(Resume.content_hash == content_hash)
+        .where(Resume.text_content.isnot(None))
+        .order_by(Resume.id.desc())
+        .limit(1)
+    )
+
+
+async def count_resumes_by_storage_path(db: AsyncSession, storage_path: str) -> int:
+    return await db.scalar(select(func.count(Resume.id)).where(Resume.storage_path == storage_path)) or 0
+
+
+def get_resumes_without_text(db: Session, after_id: int, limit: int) -> List[Resume]:
+    return (
+        db.query(Resume)
+        .filter(Resume.id > after_id)
+        .filter((Resume.text_content.is_(None)) | (Resume.text_content == ""))
+        .order_by(Resume.id)
+        .limit(limit)
+        .all()
+    )
+
+
+def get_scored_resumes(db: Session, model_version: str) -> List[Tuple[int, int, bytes]]:
+    """Return (resume id, user id, class_probs) for active resumes of active users scored by the given model."""
+    rows = (
+        db.query(Resume.id, Resume.user_id, Resume.class_probs)
+        .join(User, User.id == Resume.user_id)
+        .filter(User.is_active == True)
+        .filter(Resume.is_active == True)
+        .filter(Resume.model_version == model_version)
+        .filter(Resume.class_probs.isnot(None))
+        .all()
+    )
+    return [(row[0], row[1], row[2]) for row in rows]
+
+
+async def get_resumes_by_ids(db: AsyncSession, resume_ids: List[int]) -> List[Resume]:
+    return list(await db.scalars(select(Resume).where(Resume.id.in_(resume_ids))))
@@ -0,0 +1,21 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from core.config import settings
+from database.stats import STATS_ROW_ID
+from models.site_stats import SiteStats
+from utils.cache import TTLCache
+
+# The admin overview tolerates counters a few seconds old, so repeated loads skip the database.
+stats_cache: TTLCache[SiteStats] = TTLCache(settings.STATS_CACHE_TTL_SECONDS, 1)
+
+async def get_site_stats(db: AsyncSession) -> Optional[SiteStats]:
+    cached = stats_cache.get(STATS_ROW_ID)
+    if cached is not None:
+        return cached
+
+    stats = await db.get(SiteStats, STATS_ROW_ID)
+    if stats:
+        db.expunge(stats)
+        stats_cache.set(STATS_ROW_ID, stats)
+    return stats
@@ -1,32 +1,40 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime, timedelta, timezone
 from typing import List
 
 from core.config import settings
 from models.token import Token
+from crud.user import user_cache
 
-def create_refresh_token(db: Session, user_id: int, refresh_token_hash: str) -> Token:
-    existing_token = db.query(Token).filter(Token.user_id == user_id).first()
-    if existing_token:
-        db.delete(existing_token)
-        db.commit()
-
+async def create_refresh_token(db: AsyncSession, user_id: int, refresh_token_hash: str) -> Token:
+    """
+    Store the user's refresh token, overwriting their previous one in place. When two logins race
+    to insert the user's first token, the loser of the unique user_id constraint rolls back only
+    its savepoint and overwrites the row the winner inserted.
+    """
     expires = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    new_token = Token(
-        user_id=user_id,
-        refresh_token_hash=refresh_token_hash,
-        expires_at=expires
-    )
-    db.add(new_token)
-    db.commit()
-    db.refresh(new_token)
+    token = await db.scalar(select(Token).where(Token.user_id == user_id))
+    while token is None:
+        try:
+            async with db.begin_nested():
+                token = Token(user_id=user_id, refresh_token_hash=refresh_token_hash, expires_at=expires)
+                db.add(token)
+        except IntegrityError:
+            token = await db.scalar(select(Token).where(Token.user_id == user_id))
 
-    return new_token
+    setattr(token, "refresh_token_hash", refresh_token_hash)
+    setattr(token, "expires_at", expires)
+    await db.commit()
+    await db.refresh(token)
+    return token
 
 
-def get_tokens_for_user(db: Session, user_id: int) -> List[Token]:
-    return db.query(Token).filter(Token.user_id == user_id).all()
+async def get_tokens_for_user(db: AsyncSession, user_id: int) -> List[Token]:
+    return list(await db.scalars(select(Token).where(Token.user_id == user_id)))
 
-def revoke_tokens_for_user(db: Session, user_id: int) -> None:
-    db.query(Token).filter(Token.user_id == user_id).delete(synchronize_session=False)
-    db.commit()
+async def revoke_tokens_for_user(db: AsyncSession, user_id: int) -> None:
+    await db.execute(delete(Token).where(Token.user_id == user_id), execution_options={"synchronize_session": False})
+    await db.commit()
+    user_cache.invalidate(user_id)
@@ -1,13 +1,18 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
+from typing import Optional, List
 
-from core.security import get_password_hash
+from core.config import settings
+from core.security import hash_password
 from models.user import User
-from schemas.user import UserCreate
+from schemas.user import UserCreate, UserResponse
+from utils.cache import TTLCache
 
-def create_user(db: Session, user: UserCreate, role: str) -> User:
-    hashed_pw = get_password_hash(user.password)
+# Snapshots of recently authenticated users, keyed by id, so auth does not hit the database.
+user_cache: TTLCache[UserResponse] = TTLCache(settings.USER_CACHE_TTL_SECONDS, settings.USER_CACHE_SIZE)
+
+async def create_user(db: AsyncSession, user: UserCreate, role: str) -> User:
+    hashed_pw = await hash_password(user.password)
     db_user = User(
         name=user.name,
         email=user.email,
@@ -15,44 +20,74 @@ def create_user(db: Session, user: UserCreate, role: str) -> User:
         role=role,
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
 
-def get_user_by_email(db: Session, email: str) -> Optional[User]:
-    return db.query(User).filter(User.email == email).first()
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    return await db.scalar(select(User).where(User.email == email))
+
+
+async def get_user(db: AsyncSession, user_id: int) -> Optional[User]:
+    return await db.scalar(select(User).where(User.id == user_id))
+
+
+async def get_cached_user(db: AsyncSession, user_id: int) -> Optional[UserResponse]:
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        return cached
 
+    user = await get_user(db, user_id)
+    if not user:
+        return None
 
-def get_user(db: Session, user_id: int) -> Optional[User]:
-    return db.query(User).filter(User.id == user_id).first()
+    snapshot = UserResponse.model_validate(user)
+    user_cache.set(user_id, snapshot)
+    return snapshot
 
 
-def get_users(db: Session, skip: int = 0, limit: int = 100) -> list[User]:
-    return db.query(User).filter(User.role != "admin").offset(skip).limit(limit).all()
+async def get_users_by_ids(db: AsyncSession, user_ids: List[int]) -> List[User]:
+    return list(await db.scalars(select(User).where(User.id.in_(user_ids))))
 
 
-def activate_user(db: Session, user_id: int) -> None:
-    user = db.query(User).filter(User.id == user_id).first()
+async def get_users(db: AsyncSession, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> list[User]:
+    query = select(User).where(User.role != "admin")
+    if after_id is not None:
+        query = query.where(User.id > after_id)
+    return list(await db.scalars(query.order_by(User.id).offset(skip).limit(limit)))
+
+
+async def activate_user(db: AsyncSession, user_id: int) -> None:
+    user = await get_user(db, user_id)
     if user:
         user.is_active = True
-        db.commit()
+        await db.commit()
+    user_cache.invalidate(user_id)
+
+
+async def update_password_hash(db: AsyncSession, user_id: int, password_hash: str) -> None:
+    user = await get_user(db, user_id)
+    if user:
+        user.password_hash = password_hash
+        await db.commit()
 
 
-def deactivate_user(db: Session, user_id: int) -> None:
-    user = db.query(User).filter(User.id == user_id).first()
+async def deactivate_user(db: AsyncSession, user_id: int) -> None:
+    user = await get_user(db, user_id)
     if user:
         user.is_active = False
-        db.commit()
+        await db.commit()
+    user_cache.invalidate(user_id)
 
-def get_total_users(db: Session) -> int:
-    return db.query(func.count(User.id)).filter(User.role != "admin").scalar()
+async def get_total_users(db: AsyncSession) -> int:
+    return await db.scalar(select(func.count(User.id)).where(User.role != "admin")) or 0
 
-def get_total_active_users(db: Session) -> int:
-    return db.query(func.count(User.id)).filter(User.role != "admin").filter(User.is_active == True).scalar()
+async def get_total_active_users(db: AsyncSession) -> int:
+    return await db.scalar(select(func.count(User.id)).where(User.role != "admin").where(User.is_active == True)) or 0
 
-def get_total_candidates(db: Session) -> int:
-    return db.query(func.count(User.id)).filter(User.role == "candidate").scalar()
+async def get_total_candidates(db: AsyncSession) -> int:
+    return await db.scalar(select(func.count(User.id)).where(User.role == "candidate")) or 0
 
-def get_total_recruiters(db: Session) -> int:
-    return db.query(func.count(User.id)).filter(User.role == "recruiter").scalar()
+async def get_total_recruiters(db: AsyncSession) -> int:
+    return await db.scalar(select(func.count(User.id)).where(User.role == "recruiter")) or 0
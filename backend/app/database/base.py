@@ -1,9 +1,39 @@
-from sqlalchemy import Engine, create_engine
+from typing import Any
+
+from sqlalchemy import Engine, URL, create_engine, event, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
 from core.config import settings
 
-engine: Engine = create_engine(settings.DATABASE_URL)
+# asyncio driver used for each backend; the sync engine uses the backend's default driver.
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg", "mysql": "aiomysql"}
+
+def database_url(url: str, use_async: bool) -> URL:
+    """Return DATABASE_URL with the driver swapped to the asyncio or the default sync one."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    async_driver = ASYNC_DRIVERS.get(backend)
+    if not async_driver:
+        return parsed
+    if use_async and parsed.get_driver_name() != async_driver:
+        return parsed.set(drivername=f"{backend}+{async_driver}")
+    if not use_async and parsed.get_driver_name() == async_driver:
+        return parsed.set(drivername=backend)
+    return parsed
+
+engine: Engine = create_engine(database_url(settings.DATABASE_URL, use_async=False))
+async_engine: AsyncEngine = create_async_engine(database_url(settings.DATABASE_URL, use_async=True))
+
+def enable_sqlite_foreign_keys(dbapi_connection: Any, connection_record: Any) -> None:
+    """SQLite ignores foreign keys, and so every ON DELETE CASCADE, unless each connection switches them on."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", enable_sqlite_foreign_keys)
+    event.listen(async_engine.sync_engine, "connect", enable_sqlite_foreign_keys)
 
 class Base(DeclarativeBase):
     pass
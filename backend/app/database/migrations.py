@@ -0,0 +1,44 @@
+from sqlalchemy import Engine, inspect, text
+from sqlalchemy.schema import CreateColumn
+
+from database.base import Base
+
+
+def add_missing_columns(bind: Engine) -> None:
+    """
+    Add columns declared on the models but missing from existing tables.
+    create_all only creates missing tables, so databases created before a column was added need this.
+    """
+    inspector = inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+
+            existing_columns = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                column_ddl = CreateColumn(column).compile(dialect=bind.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column_ddl}"))
+
+
+def add_missing_indexes(bind: Engine) -> None:
+    """
+    Create indexes declared on the models but missing from existing tables.
+    create_all skips every index of a table that already exists, so new indexes need this.
+    """
+    inspector = inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+
+            existing_indexes = {i["name"] for i in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(conn)
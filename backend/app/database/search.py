@@ -0,0 +1,60 @@
+from sqlalchemy import Engine, inspect, text
+
+
+SQLITE_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN
+        INSERT INTO jobs_fts(rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE OF title, description, location ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+        INSERT INTO jobs_fts(rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END
+    """,
+]
+
+POSTGRES_DDL = [
+    """
+    ALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(location, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_jobs_search_vector ON jobs USING GIN (search_vector)",
+]
+
+
+def setup_job_search(bind: Engine) -> None:
+    """
+    Create the full-text index over jobs.title, description and location.
+    SQLite uses an external-content FTS5 table kept in sync by triggers; Postgres uses a
+    generated tsvector column with a GIN index, which the database maintains on every write.
+    """
+    if bind.dialect.name == "sqlite":
+        created = "jobs_fts" not in inspect(bind).get_table_names()
+        with bind.begin() as conn:
+            conn.execute(text(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5("
+                "title, description, location, content='jobs', content_rowid='id')"
+            ))
+            for trigger in SQLITE_TRIGGERS:
+                conn.execute(text(trigger))
+            if created:
+                conn.execute(text("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')"))
+
+    elif bind.dialect.name == "postgresql":
+        with bind.begin() as conn:
+            for ddl in POSTGRES_DDL:
+                conn.execute(text(ddl))
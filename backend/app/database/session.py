@@ -1,18 +1,16 @@
-from typing import Generator
+from typing import AsyncGenerator
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from contextlib import contextmanager
 
-from database.base import engine
+from database.base import engine, async_engine
 
 SessionLocal: sessionmaker[Session] = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal: async_sessionmaker[AsyncSession] = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
-def get_db() -> Generator[Session, None, None]:
-    db: Session = SessionLocal()
-
-    try:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 @contextmanager
 def get_sync_session():
@@ -26,4 +24,3 @@ def get_sync_session():
         raise
     finally:
         db.close()
-        
\ No newline at end of file
@@ -0,0 +1,115 @@
+from sqlalchemy import Connection, Engine, func, select, text, update, insert
+
+from models.job import Job
+from models.site_stats import SiteStats
+from models.user import User
+
+STATS_ROW_ID = 1
+
+# Condition for a users row to count towards each counter.
+_USER_COUNTERS = {
+    "total_users": "{row}.role <> 'admin'",
+    "active_users": "{row}.role <> 'admin' AND {row}.is_active",
+    "candidates": "{row}.role = 'candidate'",
+    "recruiters": "{row}.role = 'recruiter'",
+}
+
+
+def _user_counters_update(sign: str, row: str) -> str:
+    """UPDATE adding (+) or removing (-) the given trigger row's contribution to the user counters."""
+    sets = ", ".join(
+        f"{column} = {column} {sign} (CASE WHEN {condition.format(row=row)} THEN 1 ELSE 0 END)"
+        for column, condition in _USER_COUNTERS.items()
+    )
+    return f"UPDATE site_stats SET {sets} WHERE id = {STATS_ROW_ID};"
+
+
+SQLITE_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS site_stats_users_ai AFTER INSERT ON users BEGIN
+        {_user_counters_update("+", "new")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS site_stats_users_ad AFTER DELETE ON users BEGIN
+        {_user_counters_update("-", "old")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS site_stats_users_au AFTER UPDATE OF role, is_active ON users BEGIN
+        {_user_counters_update("-", "old")}
+        {_user_counters_update("+", "new")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS site_stats_jobs_ai AFTER INSERT ON jobs BEGIN
+        UPDATE site_stats SET total_jobs = total_jobs + 1 WHERE id = {STATS_ROW_ID};
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS site_stats_jobs_ad AFTER DELETE ON jobs BEGIN
+        UPDATE site_stats SET total_jobs = total_jobs - 1 WHERE id = {STATS_ROW_ID};
+    END
+    """,
+]
+
+
+POSTGRES_DDL = [
+    f"""
+    CREATE OR REPLACE FUNCTION site_stats_users() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            {_user_counters_update("-", "old")}
+        END IF;
+        IF TG_OP IN ('UPDATE', 'INSERT') THEN
+            {_user_counters_update("+", "new")}
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    f"""
+    CREATE OR REPLACE FUNCTION site_stats_jobs() RETURNS trigger AS $$
+    BEGIN
+        UPDATE site_stats SET total_jobs = total_jobs + (CASE WHEN TG_OP = 'INSERT' THEN 1 ELSE -1 END) WHERE id = {STATS_ROW_ID};
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS site_stats_users ON users",
+    "CREATE TRIGGER site_stats_users AFTER INSERT OR DELETE OR UPDATE OF role, is_active ON users FOR EACH ROW EXECUTE FUNCTION site_stats_users()",
+    "DROP TRIGGER IF EXISTS site_stats_jobs ON jobs",
+    "CREATE TRIGGER site_stats_jobs AFTER INSERT OR DELETE ON jobs FOR EACH ROW EXECUTE FUNCTION site_stats_jobs()",
+]
+
+
+def reconcile_site_stats(conn: Connection) -> None:
+    """Recount every counter from the users and jobs tables, creating the stats row if needed."""
+    non_admin = User.role != "admin"
+    counts = conn.execute(select(
+        select(func.count(User.id)).where(non_admin).scalar_subquery().label("total_users"),
+        select(func.count(User.id)).where(non_admin, User.is_active == True).scalar_subquery().label("active_users"),
+        select(func.count(User.id)).where(User.role == "candidate").scalar_subquery().label("candidates"),
+        select(func.count(User.id)).where(User.role == "recruiter").scalar_subquery().label("recruiters"),
+        select(func.count(Job.id)).scalar_subquery().label("total_jobs"),
+    )).one()._asdict()
+
+    updated = conn.execute(update(SiteStats).where(SiteStats.id == STATS_ROW_ID).values(**counts, reconciled_at=func.now()))
+    if updated.rowcount == 0:
+        conn.execute(insert(SiteStats).values(id=STATS_ROW_ID, **counts))
+
+
+def setup_site_stats(bind: Engine) -> None:
+    """
+    Install the triggers that keep site_stats in step with inserts, deletes and role or activation
+    changes on users and jobs, then recount once so the row starts out exact. Other databases get
+    no triggers and rely on the periodic reconciliation alone.
+    """
+    with bind.begin() as conn:
+        if bind.dialect.name == "sqlite":
+            for trigger in SQLITE_TRIGGERS:
+                conn.execute(text(trigger))
+        elif bind.dialect.name == "postgresql":
+            for ddl in POSTGRES_DDL:
+                conn.execute(text(ddl))
+        reconcile_site_stats(conn)
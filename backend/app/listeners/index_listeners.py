@@ -0,0 +1,14 @@
+from database.session import get_sync_session
+from utils.description_index import job_description_index
+
+
+def ensure_job_description_index() -> None:
+    """Build the job description index for the active model if it does not exist yet."""
+    with get_sync_session() as db:
+        job_description_index.ensure_built(db)
+
+
+def rebuild_job_description_index() -> None:
+    """Rebuild the job description index from the database to drop any drift between workers."""
+    with get_sync_session() as db:
+        job_description_index.rebuild(db)
@@ -0,0 +1,8 @@
+from database.base import engine
+from database.stats import reconcile_site_stats
+
+
+def reconcile_stats() -> None:
+    """Recount the site_stats counters to correct any drift from the trigger-maintained values."""
+    with engine.begin() as conn:
+        reconcile_site_stats(conn)
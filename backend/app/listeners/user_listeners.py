@@ -1,16 +1,32 @@
 from datetime import datetime, timezone
 from datetime import timedelta
+from os import path, remove
 
 from database.session import get_sync_session
+from models.resume import Resume
 from models.user import User
+from crud.user import user_cache
 
 
 def delete_deactivated_users() -> None:
-    """Delete users who have been deactivated for more than 30 days."""
+    """
+    Delete users who have been deactivated for more than 30 days. Their jobs, resumes, applications
+    and tokens go with them through ON DELETE CASCADE, and then every resume file no remaining row
+    points to is removed from disk.
+    """
     threshold_date = datetime.now(timezone.utc) - timedelta(days=30)
     with get_sync_session() as db:
-        db.query(User).filter(
+        expired = db.query(User.id).filter(
             User.is_active == False,
             User.updated_at < threshold_date
-        ).delete(synchronize_session=False)
+        ).scalar_subquery()
+        storage_paths = {str(p) for (p,) in db.query(Resume.storage_path).filter(Resume.user_id.in_(expired))}
+        db.query(User).filter(User.id.in_(expired)).delete(synchronize_session=False)
         db.commit()
+        # Deduplicated uploads share one file, which stays while another user's resume points to it.
+        still_used = {str(p) for (p,) in db.query(Resume.storage_path).filter(Resume.storage_path.in_(storage_paths))}
+    user_cache.clear()
+
+    for storage_path in storage_paths - still_used:
+        if path.exists(storage_path):
+            remove(storage_path)
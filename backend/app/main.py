@@ -1,5 +1,8 @@
+import fcntl
+from typing import Optional, TextIO
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import FastAPI
+from contextlib import asynccontextmanager
 from apscheduler.schedulers.background import BackgroundScheduler # pyright: ignore[reportMissingTypeStubs]
 
 from api.v1 import candidate
@@ -8,27 +11,51 @@ from api.v1 import admin
 from api.v1 import user
 from database.base import Base, engine
 from database.session import get_sync_session
+from database.migrations import add_missing_columns, add_missing_indexes
+from database.search import setup_job_search
+from database.stats import setup_site_stats
 
 from models.application import Application # pyright: ignore[reportUnusedImport]
 from models.job import Job # pyright: ignore[reportUnusedImport]
 from models.resume import Resume # pyright: ignore[reportUnusedImport]
+from models.site_stats import SiteStats # pyright: ignore[reportUnusedImport]
 from models.token import Token # pyright: ignore[reportUnusedImport]
 from models.user import User
 
-from schemas.user import UserCreate
-
 from core.config import settings
-from crud.user import create_user
+from core.security import get_password_hash, shutdown_hash_executor
 
 from listeners.user_listeners import delete_deactivated_users
 from listeners.token_listeners import delete_expired_tokens
+from listeners.stats_listeners import reconcile_stats
+from listeners.index_listeners import ensure_job_description_index, rebuild_job_description_index
+from utils.scoring_executor import shutdown_scoring_executor, warm_scoring_executor
+from utils.description_index import shutdown_index_update_executor
+from utils.model_registry import model_registry
 
 Base.metadata.create_all(bind=engine)
+add_missing_columns(engine)
+add_missing_indexes(engine)
+setup_job_search(engine)
+setup_site_stats(engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Start the scoring processes before the scheduler has any threads, and only in the serving process:
+    # scoring children re-import the launching module, so nothing here may run at import time.
+    warm_scoring_executor()
+    scheduler = start_scheduler()
+    yield
+    scheduler.shutdown(wait=False)
+    shutdown_scoring_executor()
+    shutdown_hash_executor()
+    shutdown_index_update_executor()
 
 app = FastAPI(
     title="Auralis Job Portal API's",
     version="1.0.0",
     description="FastAPI backend for the Job Portal with Smart Resume–Job Matching",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -60,29 +87,54 @@ def sync_admins():
             )
 
             if not existing_admin:
-                create_user(
-                    db=db,
-                    user=UserCreate(name=name, email=email, password=password),
+                db.add(User(
+                    name=name,
+                    email=email,
+                    password_hash=get_password_hash(password),
                     role="admin",
-                )
+                ))
         db.commit()
 
+_scheduler_lock: Optional[TextIO] = None
+
+def claim_maintenance_jobs(scheduler: BackgroundScheduler) -> None:
+    """
+    Add the database and index maintenance jobs to this worker's scheduler if it can take the
+    scheduler lock, so they run in one worker only. The lock is released when its holder exits,
+    and the other workers keep retrying so another one takes the jobs over.
+    """
+    global _scheduler_lock
+    if _scheduler_lock is not None:
+        return
+
+    lock_file = open(settings.SCHEDULER_LOCK_PATH, "a")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.close()
+        return
+    _scheduler_lock = lock_file
+
+    scheduler.add_job(delete_expired_tokens, "interval", minutes=30)
+    scheduler.add_job(delete_deactivated_users, "interval", days=1)
+    scheduler.add_job(reconcile_stats, "interval", minutes=settings.STATS_RECONCILE_MINUTES)
+    scheduler.add_job(ensure_job_description_index, "interval", seconds=settings.MODEL_RELOAD_SECONDS)
+    scheduler.add_job(rebuild_job_description_index, "interval", days=1)
+
 def start_scheduler() -> BackgroundScheduler:
     scheduler = BackgroundScheduler()
-    if not scheduler:
-        scheduler.add_job(delete_expired_tokens, "interval", minutes=30)
-        scheduler.add_job(delete_deactivated_users, "interval", days=1)
-        scheduler.start()
+    # Every worker reloads its own copy of the model.
+    scheduler.add_job(model_registry.reload_if_changed, "interval", seconds=settings.MODEL_RELOAD_SECONDS)
+    claim_maintenance_jobs(scheduler)
+    scheduler.add_job(claim_maintenance_jobs, "interval", minutes=1, args=[scheduler])
+    scheduler.start()
     return scheduler
 
 sync_admins()
-scheduler: BackgroundScheduler = start_scheduler()
+model_registry.current()
+ensure_job_description_index()
 
 if __name__ == "__main__":
     import uvicorn
 
-    try:
-        uvicorn.run("main:app", host="127.0.0.1", port=8000, reload=True)
-    finally:
-        if not scheduler:
-            scheduler.shutdown()
+    uvicorn.run("main:app", host="127.0.0.1", port=8000, reload=True)
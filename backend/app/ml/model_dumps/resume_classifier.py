@@ -1,4 +1,7 @@
 import pickle
+import sys
+import joblib
+import numpy as np
 import pandas as pd
 from typing import List
 from sklearn.feature_extraction.text import TfidfVectorizer
@@ -7,6 +10,9 @@ from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import MaxAbsScaler
 from sklearn.feature_selection import SelectKBest
 
+sys.path.insert(0, "../..")
+from utils.compact_classifier import CompactResumeClassifier
+
 df = pd.read_csv("../datasets/ResumeDataSet.csv")
 
 x: List[str] = df['Resume'].astype(str).tolist()
@@ -24,3 +30,13 @@ model.fit(x, y)
 
 with open("../models/resume_classifier_cnb.pkl", "wb") as f:
     pickle.dump(model, f)
+
+# Inference-only artifact: pruned vocabulary with the scaler and NB weights folded together.
+compact = CompactResumeClassifier.from_pipeline(model)
+
+max_diff = float(np.abs(model.predict_proba(x) - compact.predict_proba(x)).max())
+if max_diff > 1e-4:
+    raise SystemExit(f"Compact model differs from the pipeline by {max_diff}")
+print(f"Compact model matches the pipeline within {max_diff:.2e}")
+
+joblib.dump(compact, "../models/resume_classifier_compact.joblib")
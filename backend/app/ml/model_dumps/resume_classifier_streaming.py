@@ -0,0 +1,78 @@
+"""
+Out-of-core training for the resume classifier.
+
+Streams the dataset in chunks, vectorizes each chunk with a stateless HashingVectorizer and
+trains ComplementNB incrementally with partial_fit, so memory stays flat however many
+resumes the CSV holds. The output is a regular sklearn Pipeline that predict_resume_prob
+can load, e.g. through `python -m commands.register_model` from backend/app.
+
+Run from ml/model_dumps:
+    python resume_classifier_streaming.py [--chunk-size 10000] [--n-features 262144]
+"""
+import argparse
+import json
+import pickle
+import resource
+import sys
+import time
+from typing import List
+
+import pandas as pd
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.naive_bayes import ComplementNB
+from sklearn.pipeline import Pipeline
+
+
+def peak_memory_mb() -> float:
+    """Peak resident memory of this process; ru_maxrss is in bytes on macOS and in kilobytes elsewhere."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def train(dataset: str, output: str, chunk_size: int, n_features: int) -> int:
+    """Train the classifier chunk by chunk and pickle the pipeline. Returns the number of resumes seen."""
+    with open("../../core/jobs.json", encoding="utf-8") as f:
+        classes: List[str] = json.load(f)
+
+    vectorizer = HashingVectorizer(encoding='utf-8', decode_error='ignore', lowercase=True,
+                                   stop_words='english', token_pattern=r'(?u)\b[a-zA-Z]{2,}\b',
+                                   n_features=n_features, alternate_sign=False, norm='l2')
+    model = ComplementNB()
+
+    started = time.perf_counter()
+    rows = 0
+
+    for chunk in pd.read_csv(dataset, usecols=['Category', 'Resume'], chunksize=chunk_size):
+        x = vectorizer.transform(chunk['Resume'].astype(str))
+        y: List[str] = chunk['Category'].astype(str).tolist()
+        model.partial_fit(x, y, classes=classes)
+
+        rows += len(chunk)
+        print(f"Trained on {rows} resumes ({rows / (time.perf_counter() - started):.0f} resumes/s)")
+
+    pipeline = Pipeline([
+            ('hashing', vectorizer),
+            ('model', model)
+        ])
+
+    with open(output, "wb") as f:
+        pickle.dump(pipeline, f)
+
+    elapsed = time.perf_counter() - started
+    print(f"Wrote {output}: {rows} resumes in {elapsed:.1f}s, peak memory {peak_memory_mb():.0f} MB")
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dataset", default="../datasets/ResumeDataSet.csv")
+    parser.add_argument("--output", default="../models/resume_classifier_cnb_streaming.pkl")
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    parser.add_argument("--n-features", type=int, default=2 ** 18)
+    args = parser.parse_args()
+
+    train(args.dataset, args.output, args.chunk_size, args.n_features)
+
+
+if __name__ == "__main__":
+    main()
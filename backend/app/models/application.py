@@ -1,5 +1,5 @@
 from sqlalchemy import (
-    Column, Integer, String, DateTime, Text, ForeignKey, Float
+    Column, Integer, String, DateTime, Text, ForeignKey, Float, Index
 )
 from sqlalchemy.orm import relationship, mapped_column, Mapped
 from sqlalchemy.sql import func
@@ -8,13 +8,19 @@ from database.base import Base
 
 class Application(Base):
     __tablename__ = "applications"
+    __table_args__ = (
+        Index("ix_applications_job_id_similarity_score", "job_id", "similarity_score"),
+        Index("ix_applications_candidate_id_job_id", "candidate_id", "job_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"))
     candidate_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
-    resume_id = Column(Integer, ForeignKey("resumes.id", ondelete="SET NULL"))
+    resume_id = Column(Integer, ForeignKey("resumes.id", ondelete="SET NULL"), index=True)
     cover_letter = Column(Text)
     similarity_score: Mapped[float] = mapped_column(Float, nullable=False)
+    description_score = Column(Float)
+    model_version = Column(String(64))
     status = Column(String(50), default="applied")
     applied_at = Column(DateTime(timezone=True), server_default=func.now())
 
@@ -10,7 +10,7 @@ class Job(Base):
     __tablename__ = "jobs"
 
     id = Column(Integer, primary_key=True, index=True)
-    recruiter_id = Column(Integer, ForeignKey("users.id", ondelete="cascade"), nullable=False)
+    recruiter_id = Column(Integer, ForeignKey("users.id", ondelete="cascade"), nullable=False, index=True)
     title = Column(String(255), nullable=False)
     description = Column(Text)
     location = Column(String(255), nullable=False)
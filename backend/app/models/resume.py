@@ -1,5 +1,5 @@
 from sqlalchemy import (
-    Column, Integer, String, Boolean, DateTime, Text, ForeignKey
+    Column, Integer, String, Boolean, DateTime, Text, ForeignKey, LargeBinary
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -10,10 +10,13 @@ class Resume(Base):
     __tablename__ = "resumes"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True)
     filename = Column(String(255))
-    storage_path = Column(String(512))
+    storage_path = Column(String(512), index=True)
+    content_hash = Column(String(64), index=True)
     text_content = Column(Text)
+    class_probs = Column(LargeBinary)
+    model_version = Column(String(64), index=True)
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
     is_active = Column(Boolean, default=True)
 
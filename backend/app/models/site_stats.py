@@ -0,0 +1,18 @@
+from sqlalchemy import (
+    Column, Integer, DateTime
+)
+from sqlalchemy.sql import func
+
+from database.base import Base
+
+class SiteStats(Base):
+    """Single-row table of site-wide counters, kept current by database triggers on users and jobs."""
+    __tablename__ = "site_stats"
+
+    id = Column(Integer, primary_key=True)
+    total_users = Column(Integer, nullable=False, default=0)
+    active_users = Column(Integer, nullable=False, default=0)
+    candidates = Column(Integer, nullable=False, default=0)
+    recruiters = Column(Integer, nullable=False, default=0)
+    total_jobs = Column(Integer, nullable=False, default=0)
+    reconciled_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,5 +1,5 @@
 from sqlalchemy import (
-    Column, Integer, String, Boolean, DateTime
+    Column, Integer, String, Boolean, DateTime, Index
 )
 from sqlalchemy.orm import relationship, mapped_column
 from sqlalchemy.sql import func
@@ -8,6 +8,10 @@ from database.base import Base
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_role_is_active", "role", "is_active"),
+        Index("ix_users_is_active_updated_at", "is_active", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     role = Column(String(20), nullable=False)
@@ -1,5 +1,8 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
+from typing import List, Optional
+
+MAX_BULK_APPLY_JOBS = 100
 
 class ApplicationResponse(BaseModel):
     id: int
@@ -7,7 +10,29 @@ class ApplicationResponse(BaseModel):
     candidate_id: int
     status: str
     similarity_score: float
+    description_score: Optional[float] = None
     applied_at: datetime
 
     class Config:
         from_attributes = True
+
+
+class BulkApplyRequest(BaseModel):
+    job_ids: List[int] = Field(min_length=1, max_length=MAX_BULK_APPLY_JOBS)
+
+
+class ApplyJobResult(BaseModel):
+    job_id: int
+    status: str
+    application: Optional[ApplicationResponse] = None
+
+
+class JobApplicationResponse(BaseModel):
+    application_id: int
+    applicant_name: str
+    email: str
+    resume_filename: Optional[str] = None
+    resume_url: str
+    similarity_score: float
+    description_score: Optional[float] = None
+    status: str
@@ -1,11 +1,11 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional
 
 class JobBase(BaseModel):
     description: Optional[str]
-    location: str
-    employment_type: Optional[str]
+    location: str = Field(max_length=255)
+    employment_type: Optional[str] = Field(max_length=50)
 
 
 class JobCreate(JobBase):
@@ -20,3 +20,7 @@ class JobResponse(JobBase):
 
     class Config:
         from_attributes = True
+
+
+class RecommendedJobResponse(JobResponse):
+    match_score: float
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+class Page(BaseModel, Generic[T]):
+    """
+    A page of list results. Offset pages carry total, skip, page and total_pages; cursor pages
+    carry next_cursor and total only when it was asked for. Unset fields are left out of the JSON.
+    """
+    data: List[T]
+    limit: int
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+    skip: Optional[int] = None
+    page: Optional[int] = None
+    total_pages: Optional[int] = None
@@ -0,0 +1,14 @@
+"""
+Fail the suite when a crud query starts scanning a whole table it should reach through an index.
+The cases and the seeded data live in benchmarks/query_plans.py, which prints the offending plans.
+
+Run from backend/app:
+    python -m pytest
+"""
+import asyncio
+
+from benchmarks.query_plans import run
+
+
+def test_crud_queries_use_indexes() -> None:
+    assert asyncio.run(run(users=2000, jobs=500, applications=10000, verbose=False)) == 0
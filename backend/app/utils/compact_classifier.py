@@ -0,0 +1,151 @@
+import hashlib
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from scipy import sparse
+
+
+@lru_cache(maxsize=1 << 16)
+def _term_hash(term: str) -> int:
+    return int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class CompactResumeClassifier:
+    """
+    Inference-only form of the TF-IDF → MaxAbsScaler → SelectKBest → ComplementNB pipeline.
+
+    Only the terms kept by SelectKBest are in the vocabulary. Their idf, the scaler's divisor
+    and the NB feature log-probabilities are folded into one (terms x classes) weight matrix,
+    so prediction is tokenize → sparse dot product → softmax. Terms that SelectKBest drops still
+    count toward the TF-IDF L2 norm, so their squared idf is kept in a sorted array keyed by a
+    64-bit hash of the term instead of a full vocabulary dict.
+    """
+
+    def __init__(
+        self,
+        classes: np.ndarray,
+        vocabulary: Dict[str, int],
+        idf: np.ndarray,
+        weights: np.ndarray,
+        dropped_hashes: np.ndarray,
+        dropped_idf_sq: np.ndarray,
+        token_pattern: str,
+        lowercase: bool,
+        class_log_prior: Optional[np.ndarray] = None,
+    ) -> None:
+        self.classes_ = classes
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.weights = weights
+        self.dropped_hashes = dropped_hashes
+        self.dropped_idf_sq = dropped_idf_sq
+        self.token_pattern = token_pattern
+        self.lowercase = lowercase
+        self.class_log_prior = class_log_prior
+        self._token_re = re.compile(token_pattern)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_token_re"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._token_re = re.compile(self.token_pattern)
+
+    @classmethod
+    def from_pipeline(cls, pipeline: Any) -> "CompactResumeClassifier":
+        """Fold a fitted tfidf/scale/select/model pipeline into a compact classifier."""
+        tfidf = pipeline.named_steps["tfidf"]
+        scaler = pipeline.named_steps["scale"]
+        selector = pipeline.named_steps["select"]
+        nb = pipeline.named_steps["model"]
+
+        terms = tfidf.get_feature_names_out()
+        selected = selector.get_support(indices=True)
+        dropped = np.setdiff1d(np.arange(len(terms)), selected)
+
+        weights = (tfidf.idf_[selected] / scaler.scale_[selected])[:, np.newaxis] * nb.feature_log_prob_.T
+        dropped_hashes = np.array([_term_hash(str(terms[i])) for i in dropped], dtype=np.uint64)
+        order = np.argsort(dropped_hashes)
+
+        return cls(
+            classes=nb.classes_,
+            vocabulary={str(terms[i]): col for col, i in enumerate(selected)},
+            idf=tfidf.idf_[selected].astype(np.float32),
+            weights=weights.astype(np.float32),
+            dropped_hashes=dropped_hashes[order],
+            dropped_idf_sq=(tfidf.idf_[dropped] ** 2)[order].astype(np.float32),
+            token_pattern=tfidf.token_pattern,
+            lowercase=tfidf.lowercase,
+            class_log_prior=nb.class_log_prior_ if len(nb.classes_) == 1 else None,
+        )
+
+    def _count_terms(self, texts: List[str]):
+        """
+        Count terms of every text. Returns the (texts x selected terms) count matrix and, per text,
+        the squared TF-IDF norm contributed by terms outside the selection.
+        """
+        indptr: List[int] = [0]
+        indices: List[int] = []
+        counts: List[int] = []
+        other_rows: List[int] = []
+        other_terms: List[str] = []
+        other_counts: List[int] = []
+        get = self.vocabulary.get
+
+        for row, text in enumerate(texts):
+            for term, count in Counter(self._token_re.findall(text.lower() if self.lowercase else text)).items():
+                col = get(term)
+                if col is None:
+                    other_rows.append(row)
+                    other_terms.append(term)
+                    other_counts.append(count)
+                else:
+                    indices.append(col)
+                    counts.append(count)
+            indptr.append(len(indices))
+
+        tf = sparse.csr_matrix(
+            (np.array(counts, dtype=np.float64), np.array(indices, dtype=np.int64), np.array(indptr, dtype=np.int64)),
+            shape=(len(texts), len(self.vocabulary)),
+        )
+
+        other_norm_sq = np.zeros(len(texts), dtype=np.float64)
+        if other_terms and len(self.dropped_hashes):
+            hashes = np.array([_term_hash(t) for t in other_terms], dtype=np.uint64)
+            pos = np.minimum(np.searchsorted(self.dropped_hashes, hashes), len(self.dropped_hashes) - 1)
+            found = self.dropped_hashes[pos] == hashes
+            weights = np.array(other_counts, dtype=np.float64)[found] ** 2 * self.dropped_idf_sq[pos[found]]
+            other_norm_sq = np.bincount(np.array(other_rows)[found], weights=weights, minlength=len(texts))
+
+        return tf, other_norm_sq
+
+    def predict_log_proba(self, texts: List[str]) -> np.ndarray:
+        tf, other_norm_sq = self._count_terms(texts)
+        norms = np.sqrt(tf.multiply(tf) @ (self.idf.astype(np.float64) ** 2) + other_norm_sq)
+        norms[norms == 0] = 1.0
+
+        jll = np.asarray(tf @ self.weights, dtype=np.float64) / norms[:, np.newaxis]
+        if self.class_log_prior is not None:
+            jll += self.class_log_prior
+
+        top = jll.max(axis=1, keepdims=True)
+        return jll - (top + np.log(np.exp(jll - top).sum(axis=1, keepdims=True)))
+
+    def predict_proba(self, texts: List[str]) -> np.ndarray:
+        return np.exp(self.predict_log_proba(texts))
+
+    def predict(self, texts: List[str]) -> np.ndarray:
+        return self.classes_[self.predict_log_proba(texts).argmax(axis=1)]
+
+    def transform(self, texts: List[str]) -> sparse.csr_matrix:
+        """L2-normalised TF-IDF vectors over the selected vocabulary."""
+        tf, _ = self._count_terms(texts)
+        tfidf = tf.multiply(self.idf.astype(np.float64)).tocsr()
+        norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.csr_matrix(sparse.diags(1.0 / norms) @ tfidf, dtype=np.float32)
@@ -0,0 +1,198 @@
+import asyncio
+import fcntl
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from crud.job import get_active_job_descriptions
+from utils.model_registry import LoadedModel, model_registry
+
+
+class JobDescriptionIndex:
+    """
+    TF-IDF vectors of every open job's description, stored as one CSR matrix with a row per job.
+
+    The vectors come from the active classifier's own vectorizer and are L2-normalised, so the
+    cosine similarity between a resume and every job is a single sparse matrix-vector product.
+    The matrix is persisted per model version under DESCRIPTION_INDEX_DIR; the API workers
+    update it incrementally as jobs are added or removed, and scoring processes reload it
+    whenever the file changes. Writers hold an exclusive lock on a file next to the matrix
+    while they reload, modify and replace it, so concurrent workers never drop each other's rows.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+        self._mtime: Optional[int] = None
+        self._job_ids = np.empty(0, dtype=np.int64)
+        self._matrix = sparse.csr_matrix((0, 0), dtype=np.float32)
+        self._rows: Dict[int, int] = {}
+
+    def _path(self, version: str) -> str:
+        return os.path.join(self.root, f"job_descriptions_{version}.npz")
+
+    @contextmanager
+    def _file_lock(self, version: str) -> Iterator[None]:
+        """Hold the cross-process write lock of the matrix for the given model version."""
+        os.makedirs(self.root, exist_ok=True)
+        with open(f"{self._path(version)}.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _set(self, version: str, job_ids: np.ndarray, matrix: sparse.csr_matrix, mtime: Optional[int]) -> None:
+        self._version = version
+        self._mtime = mtime
+        self._job_ids = job_ids
+        self._matrix = matrix
+        self._rows = {int(job_id): row for row, job_id in enumerate(job_ids)}
+
+    def _save(self) -> None:
+        assert self._version is not None
+        os.makedirs(self.root, exist_ok=True)
+        path = self._path(self._version)
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(
+            tmp_path,
+            job_ids=self._job_ids,
+            data=self._matrix.data,
+            indices=self._matrix.indices,
+            indptr=self._matrix.indptr,
+            shape=np.array(self._matrix.shape),
+        )
+        os.replace(tmp_path, path)
+        self._mtime = os.stat(path).st_mtime_ns
+
+    def _reload_if_changed(self, model: LoadedModel) -> bool:
+        """Load the persisted matrix for the model if it changed on disk. Returns False if there is none."""
+        path = self._path(model.version)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return False
+
+        if self._version != model.version or self._mtime != mtime:
+            with np.load(path) as f:
+                matrix = sparse.csr_matrix((f["data"], f["indices"], f["indptr"]), shape=tuple(f["shape"]))
+                self._set(model.version, f["job_ids"], matrix, mtime)
+        return True
+
+    def _vectorize(self, model: LoadedModel, texts: List[str]) -> sparse.csr_matrix:
+        vectorizer = model.pipeline.steps[0][1] if hasattr(model.pipeline, "steps") else model.pipeline
+        if not texts:
+            return sparse.csr_matrix((0, vectorizer.transform([""]).shape[1]), dtype=np.float32)
+        return sparse.csr_matrix(vectorizer.transform(texts), dtype=np.float32)
+
+    def rebuild(self, db: Session) -> None:
+        """Vectorize every open job's description and persist the matrix for the active model."""
+        model = model_registry.current()
+        # Read the jobs under the file lock, so a job committed meanwhile is appended after this save.
+        with self._lock, self._file_lock(model.version):
+            rows = get_active_job_descriptions(db)
+            job_ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+            matrix = self._vectorize(model, [row[1] or "" for row in rows])
+            self._set(model.version, job_ids, matrix, None)
+            self._save()
+
+    def ensure_built(self, db: Session) -> None:
+        """Build the matrix for the active model if it has not been persisted yet."""
+        with self._lock:
+            built = self._reload_if_changed(model_registry.current())
+        if not built:
+            self.rebuild(db)
+
+    def add_jobs(self, jobs: List[Tuple[int, Optional[str]]]) -> None:
+        """Append or replace the rows of the given (job id, description) pairs and persist the matrix once."""
+        model = model_registry.current()
+        if not jobs:
+            return
+        with self._lock, self._file_lock(model.version):
+            if not self._reload_if_changed(model):
+                return
+            new_ids = np.array([job_id for job_id, _ in jobs], dtype=np.int64)
+            vectors = self._vectorize(model, [description or "" for _, description in jobs])
+            keep = np.flatnonzero(~np.isin(self._job_ids, new_ids))
+            self._set(
+                model.version,
+                np.concatenate([self._job_ids[keep], new_ids]),
+                sparse.vstack([self._matrix[keep], vectors], format="csr"),
+                self._mtime,
+            )
+            self._save()
+
+    def remove_job(self, job_id: int) -> None:
+        """Drop one job's row and persist the matrix."""
+        model = model_registry.current()
+        with self._lock, self._file_lock(model.version):
+            if not self._reload_if_changed(model) or job_id not in self._rows:
+                return
+            keep = np.flatnonzero(self._job_ids != job_id)
+            self._set(model.version, self._job_ids[keep], self._matrix[keep], self._mtime)
+            self._save()
+
+    def score_all(self, resume_text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (job ids, cosine similarities) of the resume against every indexed job."""
+        model = model_registry.current()
+        with self._lock:
+            if not self._reload_if_changed(model):
+                return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+            job_ids, matrix = self._job_ids, self._matrix
+
+        resume_vector = self._vectorize(model, [resume_text])
+        return job_ids, (matrix @ resume_vector.T).toarray().ravel()
+
+    def score(self, resume_text: str, job_ids: List[int]) -> Dict[int, float]:
+        """Return the cosine similarity of the resume against each given job that is indexed."""
+        model = model_registry.current()
+        with self._lock:
+            if not self._reload_if_changed(model):
+                return {}
+            found = [job_id for job_id in job_ids if job_id in self._rows]
+            rows = [self._rows[job_id] for job_id in found]
+            matrix = self._matrix[rows]
+
+        if not found:
+            return {}
+        resume_vector = self._vectorize(model, [resume_text])
+        scores = (matrix @ resume_vector.T).toarray().ravel()
+        return {job_id: float(score) for job_id, score in zip(found, scores)}
+
+
+job_description_index = JobDescriptionIndex(settings.DESCRIPTION_INDEX_DIR)
+
+# One thread per process applies index updates in order, off the event loop.
+_update_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_index_update_executor() -> ThreadPoolExecutor:
+    global _update_executor
+    if _update_executor is None:
+        _update_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="description-index")
+    return _update_executor
+
+
+def shutdown_index_update_executor() -> None:
+    global _update_executor
+    if _update_executor is not None:
+        _update_executor.shutdown(wait=True)
+        _update_executor = None
+
+
+async def index_jobs(jobs: List[Tuple[int, Optional[str]]]) -> None:
+    """Vectorize and persist the rows of the given (job id, description) pairs without blocking the event loop."""
+    await asyncio.get_running_loop().run_in_executor(get_index_update_executor(), job_description_index.add_jobs, jobs)
+
+
+async def unindex_job(job_id: int) -> None:
+    """Drop one job's row from the persisted matrix without blocking the event loop."""
+    await asyncio.get_running_loop().run_in_executor(get_index_update_executor(), job_description_index.remove_job, job_id)
@@ -0,0 +1,69 @@
+import hashlib
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+from fastapi.responses import FileResponse
+
+# Resumes are private to the requester, and the same URL serves a new file after a re-upload,
+# so browsers may keep a copy but must revalidate it (a cheap 304) before every use.
+RESUME_CACHE_CONTROL = "private, max-age=0, must-revalidate"
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+def _not_modified_since(if_modified_since: str, mtime: float) -> bool:
+    try:
+        return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+
+
+def cached_file_response(
+    request: Request,
+    file_path: str,
+    filename: str,
+    content_hash: Optional[str] = None,
+    media_type: str = "application/pdf",
+    cache_control: str = RESUME_CACHE_CONTROL,
+) -> Response:
+    """
+    Serve a file with ETag, Last-Modified and Cache-Control validators, answering 304 when the
+    client's copy is current. The ETag is the file's content hash when known, otherwise it is
+    derived from mtime and size. Range and If-Range requests are handled by FileResponse.
+    """
+    stat_result = os.stat(file_path)
+    if content_hash:
+        etag = f'"{content_hash}"'
+    else:
+        etag = f'"{hashlib.md5(f"{stat_result.st_mtime}-{stat_result.st_size}".encode(), usedforsecurity=False).hexdigest()}"'
+
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(stat_result.st_mtime, usegmt=True),
+        "Cache-Control": cache_control,
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, etag)
+    else:
+        not_modified = if_modified_since is not None and _not_modified_since(if_modified_since, stat_result.st_mtime)
+
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+
+    return FileResponse(
+        path=file_path,
+        filename=filename,
+        media_type=media_type,
+        headers=headers,
+        stat_result=stat_result,
+    )
@@ -0,0 +1,69 @@
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from crud.job import get_active_job_titles
+
+
+class JobTitleIndex:
+    """
+    In-memory index of open jobs used to rank them against a class-probability vector.
+
+    Jobs are stored as parallel arrays of ids and title codes, so scoring every open job is
+    one gather from a per-title score table. The index is rebuilt when invalidated by a job
+    change in this process, or after JOB_INDEX_TTL_SECONDS to catch changes made by other workers.
+    """
+
+    def __init__(self, ttl_seconds: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._job_ids = np.empty(0, dtype=np.int64)
+        self._title_codes = np.empty(0, dtype=np.int32)
+        self._titles: List[str] = []
+        self._built_at: Optional[float] = None
+
+    def invalidate(self) -> None:
+        self._built_at = None
+
+    def _ensure_built(self, db: Session) -> None:
+        built_at = self._built_at
+        if built_at is not None and time.monotonic() - built_at < self.ttl_seconds:
+            return
+
+        with self._lock:
+            if self._built_at is not None and self._built_at != built_at:
+                return
+            rows = get_active_job_titles(db)
+            job_ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+            titles, codes = np.unique(np.array([str(row[1]) for row in rows], dtype=object), return_inverse=True)
+            self._job_ids = job_ids
+            self._title_codes = codes.astype(np.int32)
+            self._titles = [str(t) for t in titles]
+            self._built_at = time.monotonic()
+
+    def top_k(self, db: Session, probs: np.ndarray, class_index: Dict[str, int], k: int, exclude_job_ids: Optional[List[int]] = None) -> List[Tuple[int, float]]:
+        """Return up to k (job id, score) pairs for the open jobs with the highest scores."""
+        self._ensure_built(db)
+        job_ids, title_codes, titles = self._job_ids, self._title_codes, self._titles
+        if k <= 0 or not len(job_ids):
+            return []
+
+        title_scores = np.array(
+            [probs[class_index[t]] if t in class_index else 0.0 for t in titles],
+            dtype=np.float32,
+        )
+        scores = title_scores[title_codes]
+        if exclude_job_ids:
+            scores = np.where(np.isin(job_ids, exclude_job_ids), -np.inf, scores)
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(job_ids[i]), float(scores[i])) for i in top if np.isfinite(scores[i])]
+
+
+job_title_index = JobTitleIndex(settings.JOB_INDEX_TTL_SECONDS)
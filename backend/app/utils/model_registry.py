@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import joblib
+
+from core.config import settings
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    """An immutable snapshot of one model version. Callers keep it for the whole scoring call."""
+    version: str
+    pipeline: Any
+    class_index: Dict[str, int]
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+class ModelRegistry:
+    """
+    Versioned store of resume classifiers.
+
+    Each version lives in <root>/<version>/model.joblib, dumped uncompressed so its numpy
+    arrays are memory-mapped on load and shared between processes through the page cache.
+    <root>/CURRENT names the active version; activating a version rewrites it atomically
+    and every process picks the change up through reload_if_changed().
+    """
+
+    def __init__(self, root: str, fallback_path: str) -> None:
+        self.root = root
+        self.fallback_path = fallback_path
+        self._lock = threading.Lock()
+        self._current: Optional[LoadedModel] = None
+        self._current_mtime: Optional[int] = None
+
+    @property
+    def _current_file(self) -> str:
+        return os.path.join(self.root, "CURRENT")
+
+    def _version_dir(self, version: str) -> str:
+        return os.path.join(self.root, version)
+
+    def _read_current_version(self) -> Optional[str]:
+        try:
+            with open(self._current_file, encoding="utf-8") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _current_file_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self._current_file).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _load_version(self, version: str) -> LoadedModel:
+        version_dir = self._version_dir(version)
+        pipeline = joblib.load(os.path.join(version_dir, "model.joblib"), mmap_mode="r")
+        with open(os.path.join(version_dir, "metadata.json"), encoding="utf-8") as f:
+            metadata = json.load(f)
+        return _snapshot(version, pipeline, metadata)
+
+    def _load_fallback(self) -> LoadedModel:
+        with open(self.fallback_path, "rb") as f:
+            model_bytes = f.read()
+        version = hashlib.sha256(model_bytes).hexdigest()[:16]
+        return _snapshot(version, pickle.loads(model_bytes), {"source": self.fallback_path})
+
+    def _load_active(self) -> LoadedModel:
+        version = self._read_current_version()
+        if version is None:
+            return self._load_fallback()
+        return self._load_version(version)
+
+    def current(self) -> LoadedModel:
+        """Return the active model, loading it on first use."""
+        model = self._current
+        if model is None:
+            with self._lock:
+                if self._current is None:
+                    self._current_mtime = self._current_file_mtime()
+                    self._current = self._load_active()
+                model = self._current
+        return model
+
+    def reload_if_changed(self) -> bool:
+        """Swap to the version named in CURRENT if the file changed since the last load."""
+        mtime = self._current_file_mtime()
+        if self._current is not None and mtime == self._current_mtime:
+            return False
+
+        with self._lock:
+            if self._current is not None and mtime == self._current_mtime:
+                return False
+            new_model = self._load_active()
+            changed = self._current is None or new_model.version != self._current.version
+            self._current = new_model
+            self._current_mtime = mtime
+        if changed:
+            print(f"Loaded resume classifier version {new_model.version}")
+        return changed
+
+    def list_versions(self) -> List[Dict[str, Any]]:
+        """Return the metadata of every registered version, newest first."""
+        if not os.path.isdir(self.root):
+            return []
+
+        versions: List[Dict[str, Any]] = []
+        for name in os.listdir(self.root):
+            metadata_path = os.path.join(self.root, name, "metadata.json")
+            if os.path.isfile(metadata_path):
+                with open(metadata_path, encoding="utf-8") as f:
+                    versions.append(json.load(f))
+        return sorted(versions, key=lambda m: m.get("registered_at", ""), reverse=True)
+
+    def register(self, artifact_path: str, metadata: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Add a pickled or joblib-dumped pipeline to the registry and return its version.
+        The version is derived from the artifact's bytes, so registering the same file twice is a no-op.
+        """
+        with open(artifact_path, "rb") as f:
+            version = hashlib.sha256(f.read()).hexdigest()[:16]
+
+        version_dir = self._version_dir(version)
+        if os.path.isdir(version_dir):
+            return version
+
+        pipeline = joblib.load(artifact_path)
+        os.makedirs(self.root, exist_ok=True)
+        tmp_dir = f"{version_dir}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        joblib.dump(pipeline, os.path.join(tmp_dir, "model.joblib"))
+        with open(os.path.join(tmp_dir, "metadata.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                **(metadata or {}),
+                "version": version,
+                "source": artifact_path,
+                "classes": [str(c) for c in pipeline.classes_],
+                "registered_at": datetime.now(timezone.utc).isoformat(),
+            }, f, indent=2)
+
+        os.replace(tmp_dir, version_dir)
+        return version
+
+    def activate(self, version: str) -> LoadedModel:
+        """Make a registered version the active one for every process and load it here."""
+        if not os.path.isfile(os.path.join(self._version_dir(version), "model.joblib")):
+            raise ValueError(f"Unknown model version: {version}")
+
+        tmp_file = f"{self._current_file}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            f.write(version)
+        os.replace(tmp_file, self._current_file)
+
+        self.reload_if_changed()
+        return self.current()
+
+
+def _snapshot(version: str, pipeline: Any, metadata: Dict[str, Any]) -> LoadedModel:
+    class_index = {str(c): i for i, c in enumerate(pipeline.classes_)}
+    return LoadedModel(version=version, pipeline=pipeline, class_index=class_index, metadata=metadata)
+
+
+model_registry = ModelRegistry(settings.MODEL_REGISTRY_DIR, settings.MODEL_FALLBACK_PATH)
@@ -0,0 +1,68 @@
+import base64
+import binascii
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+from fastapi import HTTPException, Response
+from pydantic import TypeAdapter
+
+from schemas.pagination import Page
+
+
+def encode_cursor(last_id: int) -> str:
+    """Opaque cursor pointing just after the row with this id."""
+    return base64.urlsafe_b64encode(f"id:{last_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Optional[int]:
+    """Return the id a cursor points after, or None for an empty cursor (the first page)."""
+    if not cursor:
+        return None
+    try:
+        key, _, value = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode().partition(":")
+        if key != "id":
+            raise ValueError(key)
+        return int(value)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginated(data: List[Any], row_ids: Sequence[int], skip: int, limit: int, cursor: Optional[str], total: Optional[int]) -> Dict[str, Any]:
+    """
+    Build a list response. row_ids are the ids of the rows fetched for this page, in order, and give
+    next_cursor when the page is full. Offset requests (no cursor) keep total, skip, page and
+    total_pages; cursor requests only carry total when it was asked for.
+    """
+    response: Dict[str, Any] = {
+        "data": data,
+        "limit": limit,
+        "next_cursor": encode_cursor(row_ids[-1]) if row_ids and len(row_ids) >= limit else None,
+    }
+    if cursor is None:
+        total = total or 0
+        response.update({
+            "total": total,
+            "skip": skip,
+            "page": (skip // limit) + 1,
+            "total_pages": (total + limit - 1) // limit,
+        })
+    elif total is not None:
+        response["total"] = total
+    return response
+
+
+@lru_cache(maxsize=None)
+def page_adapter(item_type: type) -> TypeAdapter[Page[Any]]:
+    """One TypeAdapter per item schema, built on first use, so the validator and serializer are reused."""
+    return TypeAdapter(Page[item_type])
+
+
+def page_response(item_type: type, content: Dict[str, Any]) -> Response:
+    """
+    Validate a list response's rows (ORM objects or dicts) into item_type and serialize it to JSON
+    in a single pass. Declare response_model=Page[item_type] on the route for the docs; FastAPI
+    returns the Response as-is without validating or encoding the content again.
+    """
+    adapter = page_adapter(item_type)
+    page = adapter.validate_python(content, from_attributes=True)
+    return Response(adapter.dump_json(page, exclude_unset=True), media_type="application/json")
@@ -0,0 +1,118 @@
+import codecs
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple, Union
+
+from fastapi import HTTPException, status
+
+# Longest line or quoted CSV record kept in memory while waiting for its end.
+MAX_RECORD_CHARS = 1024 * 1024
+
+# (line number the record starts on, its fields or an error message)
+Record = Tuple[int, Union[Dict[str, Any], str]]
+
+
+def _too_long(line: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail=f"Record starting on line {line} is longer than {MAX_RECORD_CHARS} characters",
+    )
+
+
+async def aiter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decode a UTF-8 byte stream (a leading BOM is dropped) and yield it line by line with line endings kept."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    line = 1
+    try:
+        async for chunk in chunks:
+            lines = (buffer + decoder.decode(chunk)).split("\n")
+            buffer = lines.pop()
+            for text in lines:
+                yield text + "\n"
+            line += len(lines)
+            if len(buffer) > MAX_RECORD_CHARS:
+                raise _too_long(line)
+        buffer += decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail=f"Body is not valid UTF-8 (line {line})")
+    if buffer:
+        yield buffer
+
+
+async def aiter_csv_records(lines: AsyncIterator[str]) -> AsyncIterator[Record]:
+    """
+    Parse CSV lines into dicts keyed by the header row. Quoted fields may span lines, so a record
+    is parsed once its quotes balance. Rows with the wrong number of fields become errors.
+    """
+    header: Optional[List[str]] = None
+    pending = ""
+    open_quote = False
+    start = line = 0
+    async for text in lines:
+        line += 1
+        if not pending:
+            start = line
+        pending += text
+        open_quote ^= text.count('"') % 2 == 1
+        if open_quote:
+            if len(pending) > MAX_RECORD_CHARS:
+                raise _too_long(start)
+            continue
+
+        fields = next(csv.reader([pending]), [])
+        pending = ""
+        if not any(field.strip() for field in fields):
+            continue
+        if header is None:
+            header = [field.strip() for field in fields]
+        elif len(fields) != len(header):
+            yield start, f"Expected {len(header)} fields, got {len(fields)}"
+        else:
+            yield start, dict(zip(header, fields))
+
+    if pending:
+        yield start, "Unterminated quoted field"
+
+
+async def aiter_ndjson_records(lines: AsyncIterator[str]) -> AsyncIterator[Record]:
+    """Parse one JSON object per line; blank lines are skipped and anything else becomes an error."""
+    line = 0
+    async for text in lines:
+        line += 1
+        if not text.strip():
+            continue
+        try:
+            value = json.loads(text)
+        except ValueError as e:
+            yield line, f"Invalid JSON: {e}"
+            continue
+        if isinstance(value, dict):
+            yield line, value
+        else:
+            yield line, "Expected a JSON object"
+
+
+def _jsonable(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, (datetime, date)) else value
+
+
+async def aiter_csv_chunks(columns: List[str], batches: AsyncIterator[Sequence[Sequence[Any]]]) -> AsyncIterator[bytes]:
+    """Write a header row, then one CSV chunk per batch of rows; dates are written in ISO 8601."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue().encode()
+    async for rows in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_jsonable(value) for value in row] for row in rows)
+        yield buffer.getvalue().encode()
+
+
+async def aiter_ndjson_chunks(columns: List[str], batches: AsyncIterator[Sequence[Sequence[Any]]]) -> AsyncIterator[bytes]:
+    """Write one JSON object per row, one chunk per batch of rows."""
+    async for rows in batches:
+        yield "".join(json.dumps(dict(zip(columns, row)), default=_jsonable) + "\n" for row in rows).encode()
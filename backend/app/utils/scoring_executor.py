@@ -0,0 +1,114 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, cast
+
+import numpy as np
+
+from fastapi import HTTPException, status
+
+from core.config import settings
+from models.resume import Resume
+from utils.simmilarity_score import extract_text_from_pdf, predict_resume_probs
+from utils.model_registry import model_registry
+from utils.description_index import job_description_index
+
+T = TypeVar("T")
+
+_executor: Optional[ProcessPoolExecutor] = None
+_pending: int = 0
+
+
+def _init_worker() -> None:
+    """Load the classifier once when a child process starts."""
+    model_registry.current()
+
+
+def get_scoring_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # Children fork from a clean single-threaded server, never from a worker whose threads may hold a lock.
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.SCORING_WORKERS,
+            mp_context=multiprocessing.get_context("forkserver"),
+            initializer=_init_worker,
+        )
+    return _executor
+
+
+def warm_scoring_executor() -> None:
+    """Start every scoring process and load the classifier in it before the first request needs one."""
+    executor = get_scoring_executor()
+    wait([executor.submit(_init_worker) for _ in range(settings.SCORING_WORKERS)])
+
+
+def shutdown_scoring_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def _release_slot() -> None:
+    global _pending
+    _pending -= 1
+
+
+async def run_scoring(fn: Callable[..., T], *args: Any) -> T:
+    """
+    Run a CPU-heavy scoring function in the process pool without blocking the event loop.
+    Rejects work when too many calls are already queued or running in the pool, and gives up after
+    SCORING_TIMEOUT_SECONDS. A call that timed out keeps its slot until the pool finishes it.
+    """
+    global _pending
+    if _pending >= settings.SCORING_MAX_PENDING:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Scoring queue is full, try again later")
+
+    loop = asyncio.get_running_loop()
+    future = get_scoring_executor().submit(fn, *args)
+    _pending += 1
+    # The pool finishes a call whose request timed out, so the slot is freed when the pool is done with it.
+    future.add_done_callback(lambda _: loop.is_closed() or loop.call_soon_threadsafe(_release_slot))
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout=settings.SCORING_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="Resume scoring timed out")
+
+
+def compute_resume_outputs(resume_text: Optional[str], storage_path: str) -> Tuple[str, bytes, str]:
+    """
+    Extract the resume text (unless already stored, even as empty) and its class-probability vector.
+    Runs inside a child process; returns (text, probabilities as float32 bytes, model version).
+    Empty text gets a zero vector, so the resume is recorded as scored and never parsed again.
+    """
+    model_registry.reload_if_changed()
+    model = model_registry.current()
+
+    text = resume_text if resume_text is not None else extract_text_from_pdf(storage_path)
+    if not text:
+        return text, np.zeros(len(model.class_index), dtype=np.float32).tobytes(), model.version
+    return text, predict_resume_probs(text, model).tobytes(), model.version
+
+
+def compute_description_scores(resume_text: str, job_ids: List[int]) -> Dict[int, float]:
+    """
+    Cosine similarity between the resume and the description of each job.
+    Runs inside a child process against the persisted job description index.
+    """
+    model_registry.reload_if_changed()
+    if not resume_text:
+        return {}
+    return job_description_index.score(resume_text, job_ids)
+
+
+async def ensure_resume_outputs(resume: Resume) -> np.ndarray:
+    """
+    Fill the resume's stored text and class-probability cache in the process pool when they are stale,
+    and return the probability vector. Nothing is parsed or predicted on the event loop.
+    """
+    if resume.class_probs is None or resume.model_version != model_registry.current().version:
+        text, probs, version = await run_scoring(compute_resume_outputs, resume.text_content, str(resume.storage_path))
+        setattr(resume, "text_content", text)
+        setattr(resume, "class_probs", probs)
+        setattr(resume, "model_version", version)
+    return np.frombuffer(cast(bytes, resume.class_probs), dtype=np.float32)
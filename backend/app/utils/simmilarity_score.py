@@ -1,8 +1,8 @@
-import pickle
+import numpy as np
 import pdfplumber
-from sqlalchemy.orm import Session
+from typing import List, Optional
 from models.resume import Resume
-from models.job import Job
+from utils.model_registry import LoadedModel, model_registry
 
 def extract_text_from_pdf(file_path: str) -> str:
     """Extract text from a PDF file."""
@@ -15,42 +15,50 @@ def extract_text_from_pdf(file_path: str) -> str:
         print("Error reading PDF:", e)
     return text.strip()
 
-model_filename = "ml/models/resume_classifier_cnb.pkl"
-with open(model_filename, "rb") as file:
-    loaded_model = pickle.load(file)
+def get_resume_text(resume: Resume) -> str:
+    """
+    Return the text stored for a resume.
+    Falls back to parsing the PDF when the text was never stored and keeps the result on the row,
+    even when it is empty, so a PDF without extractable text is only parsed once.
+    """
+    if resume.text_content is not None:
+        return str(resume.text_content)
 
-def predict_resume_prob(resume_text: str, job_title: str) -> float:
+    text = extract_text_from_pdf(str(resume.storage_path))
+    setattr(resume, "text_content", text)
+    return text
+
+def predict_resume_probs(resume_text: str, model: Optional[LoadedModel] = None) -> np.ndarray:
     """
-    Get the probability/confidence of the resume matching the specific job title.
-    Returns a value between 0 and 1.
+    Get the probability of the resume for every job title, in the order of the model's classes.
     """
-    classes = loaded_model.classes_ 
+    model = model or model_registry.current()
+    return model.pipeline.predict_proba([resume_text])[0].astype(np.float32)
 
-    probs = loaded_model.predict_proba([resume_text])[0]
+def predict_resume_probs_batch(resume_texts: List[str], model: Optional[LoadedModel] = None) -> np.ndarray:
+    """
+    Get the class-probability vectors for many resumes with a single predict_proba call.
+    Rows for empty texts are left as zeros, matching the single-resume scoring path.
+    """
+    model = model or model_registry.current()
+    probs = np.zeros((len(resume_texts), len(model.class_index)), dtype=np.float32)
+    rows = [i for i, text in enumerate(resume_texts) if text]
+    if rows:
+        probs[rows] = model.pipeline.predict_proba([resume_texts[i] for i in rows])
+    return probs
 
-    if job_title in classes:
-        idx = list(classes).index(job_title)
-        return float(probs[idx])
-    
-    return 0.0
+def job_title_prob(probs: np.ndarray, job_title: str, model: Optional[LoadedModel] = None) -> float:
+    """Look up the probability for a job title in a class-probability vector."""
+    model = model or model_registry.current()
+    idx = model.class_index.get(job_title)
+    if idx is None:
+        return 0.0
+    return float(probs[idx])
 
-def simimilarity_score(db: Session, resume_id: int, job_id: int) -> float:
+def predict_resume_prob(resume_text: str, job_title: str) -> float:
     """
-    Calculate similarity score between resume and job title.
+    Get the probability/confidence of the resume matching the specific job title.
     Returns a value between 0 and 1.
     """
-    pdf_file_path = db.query(Resume).filter(Resume.id == resume_id).first()
-    if not pdf_file_path:
-        raise ValueError("Resume file path not found.")
-    
-    resume_text = extract_text_from_pdf(str(pdf_file_path.storage_path))
-    if not resume_text:
-        return 0.0
-    
-    job = db.query(Job).filter(Job.id == job_id).first()
-    if not job:
-        raise ValueError("Job not found.")
-    job_title = str(job.title)
-    
-    score = predict_resume_prob(resume_text, job_title)
-    return score
+    model = model_registry.current()
+    return job_title_prob(predict_resume_probs(resume_text, model), job_title, model)
@@ -0,0 +1,103 @@
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from crud.resume import get_scored_resumes
+from models.resume import Resume
+from utils.model_registry import model_registry
+
+
+class TalentIndex:
+    """
+    In-memory index of the cached class-probability vectors of every active resume.
+
+    Rows are kept in a (resumes x classes) float32 matrix next to the owning user ids. For each
+    class the row order sorted by score is computed on first query and reused until the index
+    changes, so a top-k query is a slice. Uploads and deletes in this process update the index
+    in place; it is rebuilt from the database when the active model changes or after
+    TALENT_INDEX_TTL_SECONDS to pick up changes made by other workers. Queries never run the
+    classifier or read resume files; resumes without a vector for the active model are left out
+    until they are scored.
+    """
+
+    def __init__(self, ttl_seconds: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._user_ids = np.empty(0, dtype=np.int64)
+        self._resume_ids = np.empty(0, dtype=np.int64)
+        self._probs = np.empty((0, 0), dtype=np.float32)
+        self._order: Dict[int, np.ndarray] = {}
+        self._model_version: Optional[str] = None
+        self._built_at: Optional[float] = None
+
+    def invalidate(self) -> None:
+        self._built_at = None
+
+    def _is_fresh(self, version: str) -> bool:
+        built_at = self._built_at
+        return built_at is not None and version == self._model_version and time.monotonic() - built_at < self.ttl_seconds
+
+    def _ensure_built(self, db: Session) -> None:
+        version = model_registry.current().version
+        if self._is_fresh(version):
+            return
+
+        with self._lock:
+            # Another caller may have rebuilt the index while this one waited for the lock.
+            if self._is_fresh(version):
+                return
+            rows = get_scored_resumes(db, version)
+            self._user_ids = np.fromiter((row[1] for row in rows), dtype=np.int64, count=len(rows))
+            self._resume_ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+            self._probs = (
+                np.vstack([np.frombuffer(row[2], dtype=np.float32) for row in rows])
+                if rows else np.empty((0, 0), dtype=np.float32)
+            )
+            self._order = {}
+            self._model_version = version
+            self._built_at = time.monotonic()
+
+    def add(self, resume: Resume) -> None:
+        """Add or replace the row for a resume's owner, if the index is built for the resume's model."""
+        with self._lock:
+            if self._built_at is None or resume.class_probs is None or resume.model_version != self._model_version:
+                return
+            probs = np.frombuffer(resume.class_probs, dtype=np.float32)
+            keep = self._user_ids != resume.user_id
+            self._user_ids = np.append(self._user_ids[keep], resume.user_id)
+            self._resume_ids = np.append(self._resume_ids[keep], resume.id)
+            self._probs = np.vstack([self._probs[keep], probs]) if self._probs.size else probs[np.newaxis, :]
+            self._order = {}
+
+    def remove_user(self, user_id: int) -> None:
+        """Drop the row for a user's resume."""
+        with self._lock:
+            if self._built_at is None:
+                return
+            keep = self._user_ids != user_id
+            self._user_ids = self._user_ids[keep]
+            self._resume_ids = self._resume_ids[keep]
+            self._probs = self._probs[keep]
+            self._order = {}
+
+    def top_k(self, db: Session, class_column: int, k: int) -> List[Tuple[int, int, float]]:
+        """Return up to k (user id, resume id, score) rows with the highest score for one class."""
+        self._ensure_built(db)
+        with self._lock:
+            user_ids, resume_ids, probs = self._user_ids, self._resume_ids, self._probs
+            if k <= 0 or not len(user_ids):
+                return []
+            order = self._order.get(class_column)
+            if order is None:
+                order = np.argsort(-probs[:, class_column], kind="stable")
+                self._order[class_column] = order
+
+        top = order[:k]
+        return [(int(user_ids[i]), int(resume_ids[i]), float(probs[i, class_column])) for i in top]
+
+
+talent_index = TalentIndex(settings.TALENT_INDEX_TTL_SECONDS)
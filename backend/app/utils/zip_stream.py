@@ -0,0 +1,44 @@
+import zipfile
+from typing import Iterable, Iterator, List, Tuple, Union
+
+CHUNK_SIZE = 256 * 1024
+
+
+class _ChunkBuffer:
+    """Write-only file object that hands out what zipfile wrote since the last drain."""
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> Iterator[bytes]:
+        chunks, self._chunks = self._chunks, []
+        if chunks:
+            yield b"".join(chunks)
+
+
+def stream_zip(entries: Iterable[Tuple[str, Union[str, bytes]]]) -> Iterator[bytes]:
+    """
+    Yield a zip archive of (name, file path or bytes) entries as it is built.
+
+    Files are copied in CHUNK_SIZE pieces without compression, as PDFs are already compressed,
+    so memory stays bounded however many files the archive holds.
+    """
+    buffer = _ChunkBuffer()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+        for name, source in entries:
+            if isinstance(source, bytes):
+                archive.writestr(name, source)
+            else:
+                with open(source, "rb") as src, archive.open(name, "w", force_zip64=True) as dst:
+                    while chunk := src.read(CHUNK_SIZE):
+                        dst.write(chunk)
+                        yield from buffer.drain()
+            yield from buffer.drain()
+    yield from buffer.drain()
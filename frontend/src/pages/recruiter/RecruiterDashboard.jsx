@@ -9,7 +9,7 @@ import getMyJobs from "../../services/recruiter/getMyJobs";
 import createJob from "../../services/recruiter/createJob";
 import getJobTitles from "../../services/recruiter/getJobTitles";
 import deleteJob from "../../services/recruiter/deleteJob";
-import getJobApplications from "../../services/recruiter/getJobApplications";
+import getJobApplications, { downloadResume } from "../../services/recruiter/getJobApplications";
 import updateApplicationStatus from "../../services/recruiter/updateApplicationStatus";
 
 export default function RecruiterDashboard() {
@@ -94,15 +94,6 @@ export default function RecruiterDashboard() {
     setLoading(false);
   };
 
-  const downloadResume = (base64Data, filename) => {
-    const link = document.createElement("a");
-    link.href = `data:application/octet-stream;base64,${base64Data}`;
-    link.download = filename;
-    document.body.appendChild(link);
-    link.click();
-    document.body.removeChild(link);
-  };
-
   const handleDeleteJob = async (jobId) => {
     if (!window.confirm("Are you sure you want to delete this job?")) return;
     const res = await deleteJob(jobId);
@@ -492,7 +483,7 @@ export default function RecruiterDashboard() {
                           <button
                             onClick={() =>
                               downloadResume(
-                                app.resume_data,
+                                app.resume_url,
                                 app.resume_filename
                               )
                             }
@@ -8,13 +8,13 @@ export default async function getJobApplications(jobId, skip = 0, limit = 100) {
       params: { token, job_id: jobId, skip, limit },
     });
 
-    // Map the response to include base64 data for download
+    // Map the response to include the resume download URL
     const apps = res.data.data.map((a) => ({
       application_id: a.application_id,
       applicant_name: a.applicant_name,
       email: a.email,
       resume_filename: a.resume_filename,
-      resume_data: a.resume_data, // base64 string
+      resume_url: a.resume_url,
       similarity_score: a.similarity_score,
       status: a.status,
     }));
@@ -29,9 +29,15 @@ export default async function getJobApplications(jobId, skip = 0, limit = 100) {
 }
 
 // Helper to download resume
-export function downloadResume(base64Data, filename) {
+export async function downloadResume(resumeUrl, filename) {
+  const token = localStorage.getItem("authToken");
+  const res = await api.get(resumeUrl, { params: { token }, responseType: "blob" });
+
   const link = document.createElement("a");
-  link.href = `data:application/octet-stream;base64,${base64Data}`;
+  link.href = URL.createObjectURL(res.data);
   link.download = filename;
+  document.body.appendChild(link);
   link.click();
+  document.body.removeChild(link);
+  URL.revokeObjectURL(link.href);
 }